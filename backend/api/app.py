@@ -10,21 +10,42 @@ import logging
 import tempfile
 import threading
 import uuid
-import re
 import time
+import functools
+import hashlib
+import itertools
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, cleanup then runs in every process
+    fcntl = None
+import orjson
+
+# Repo root (three levels up from backend/api/app.py), computed once
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LOCAL_DEV_ENV_PATH = os.path.join(ROOT_DIR, 'config', 'local-dev', '.env')
 
 # Add project root to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, ROOT_DIR)
 
-from werkzeug.utils import secure_filename
-from flask import Flask, request, jsonify, send_file
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import ClientDisconnected, NotFound, RequestEntityTooLarge
+from flask import Flask, Response, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit, join_room
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.parser import ParseFailedException
+from streaming_form_data.targets import FileTarget, ListTarget
 
 from cli.main import run_pipeline
 from backend.core.presets import load_presets
 from backend.core.gpx_processing import load_gpx_track
+from backend.core.export import tags_as_text
 
 # Setup logging
 logging.basicConfig(
@@ -33,37 +54,79 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, used by jsonify() and request.get_json()."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str decode/re-encode in dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 # Flask app initialization
 # Note: This module is now under backend/ instead of docker/
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB max file size
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 app.config['JSON_SORT_KEYS'] = False
 
 # Initialize SocketIO (optional, graceful fallback to polling)
+# WebSocket-first; engine.io falls back to long-polling on its own (threading mode needs simple-websocket)
 try:
     socketio = SocketIO(
         app,
         cors_allowed_origins="*",
         async_mode="threading",
+        json=app.json,  # Encode packets with the same orjson provider as HTTP responses
         ping_timeout=60,
         ping_interval=25,
         engineio_logger=False,
         logger=False,
-        transports=['polling']  # Force polling only, disable WebSocket
     )
     SOCKETIO_ENABLED = True
-    logger.info("SocketIO initialized for real-time updates (polling mode)")
+    logger.info("SocketIO initialized for real-time updates (websocket with polling fallback)")
 except Exception as e:
     logger.warning(f"SocketIO initialization failed: {e}. Falling back to polling.")
     socketio = None
     SOCKETIO_ENABLED = False
 
-ALLOWED_EXTENSIONS = {'gpx'}
+ALLOWED_EXTENSION = '.gpx'
+
+# Multipart fields accepted by /api/process (parsed straight off request.stream)
+PROCESS_FORM_FIELDS = ('marker_lat', 'marker_lon', 'project_name', 'radius_km', 'step_km', 'preset', 'include', 'exclude')
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
-# Job tracking system (thread-safe dict)
+# Job tracking system: there is no global lock. Single-key dict assignments/pops are
+# atomic in CPython, and job entries are copy-on-write: update_job builds a new dict
+# under the job's own lock (job_locks) and rebinds it, so readers get a consistent
+# snapshot without locking. Treat dicts returned by get_job as read-only.
 job_registry = {}
-job_registry_lock = threading.Lock()
+job_locks = {}
+
+# Job fields sent to clients via status/SocketIO (mirrors JobStatus in frontend/src/api.ts);
+# everything else (geojson file, etags, temp paths, timestamps) stays server-side
+STATUS_KEYS = (
+    'id', 'state', 'percent', 'message', 'project_name', 'created_at',
+    'excel_file', 'html_file', 'rows_count', 'track_length_km', 'error',
+)
+
+# State/message changes and percent steps of at least 1 are always emitted via SocketIO;
+# smaller percent moves are emitted at most this often
+PROGRESS_EMIT_INTERVAL_SECONDS = 0.25
+
+# Progress snapshots waiting to be emitted by the dedicated emitter thread
+emit_queue = queue.SimpleQueue()
 
 
 # ============================================================================
@@ -77,6 +140,16 @@ def _parse_semicolon_list(value: str | None, default: list = None) -> list:
     return [item.strip() for item in value.split(';') if item.strip()]
 
 
+def _get_str(key: str, default: str) -> str:
+    """Get string from environment variable."""
+    return os.getenv(key, default)
+
+
+def _get_list(key: str, default: list | None = None) -> list:
+    """Get semicolon-separated list from environment variable."""
+    return _parse_semicolon_list(os.getenv(key), default=list(default) if default else None)
+
+
 def _get_int(key: str, default: int) -> int:
     """Get integer from environment variable."""
     try:
@@ -104,62 +177,77 @@ def _get_bool(key: str, default: bool = False) -> bool:
     return value.strip().lower() in {'1', 'true', 'yes', 'on'}
 
 
+_DOTENV_MTIME = None
+
+
+def _load_local_dev_env():
+    """Load config/local-dev/.env once; re-parse only if the file changed since the last load."""
+    global _DOTENV_MTIME
+    try:
+        mtime = os.path.getmtime(LOCAL_DEV_ENV_PATH)
+    except OSError:
+        return
+    if mtime == _DOTENV_MTIME:
+        return
+    load_dotenv(LOCAL_DEV_ENV_PATH)
+    _DOTENV_MTIME = mtime
+
+
+# Environment variable -> (config path, parser, default); parsers take (key, default)
+ENV_CONFIG_MAP = (
+    ('WA_PROJECT_NAME', ('project', 'name'), _get_str, 'MyProject'),
+    ('WA_OUTPUT_PATH', ('project', 'output_path'), _get_str, './data/output'),
+    ('WA_TIMEZONE', ('project', 'timezone'), _get_str, 'UTC'),
+    ('WA_RADIUS_KM', ('search', 'radius_km'), _get_float, 5.0),
+    ('WA_STEP_KM', ('search', 'step_km'), _get_float, None),  # None = auto-calculate
+    ('WA_PRESETS', ('search', 'presets'), _get_list, None),
+    ('WA_SEARCH_INCLUDE', ('search', 'include'), _get_list, None),
+    ('WA_SEARCH_EXCLUDE', ('search', 'exclude'), _get_list, None),
+    ('WA_OVERPASS_RETRIES', ('overpass', 'retries'), _get_int, 5),
+    ('WA_BATCH_KM', ('overpass', 'batch_km'), _get_float, 50.0),
+    ('WA_OVERPASS_SERVERS', ('overpass', 'servers'), _get_list, (
+        'https://overpass.private.coffee/api/interpreter',
+        'https://overpass-api.de/api/interpreter',
+        'https://lz4.overpass-api.de/api/interpreter',
+    )),
+    ('WA_TRACK_COLOR', ('map', 'track_color'), _get_str, 'blue'),
+    ('WA_DEFAULT_MARKER_COLOR', ('map', 'default_marker_color'), _get_str, 'gray'),
+    ('WA_MARKER_COLOR_PALETTE', ('map', 'marker_color_palette'), _get_list, (
+        'orange', 'purple', 'green', 'blue', 'darkred', 'darkblue', 'darkgreen', 'cadetblue', 'pink',
+    )),
+    ('WA_CLEANUP_INTERVAL_SECONDS', ('cleanup', 'interval_seconds'), _get_int, 600),
+    ('WA_JOB_TTL_SECONDS', ('cleanup', 'job_ttl_seconds'), _get_int, 21600),
+    ('WA_TEMP_FILE_MAX_AGE_SECONDS', ('cleanup', 'temp_file_max_age_seconds'), _get_int, 3600),
+    ('WA_OUTPUT_RETENTION_DAYS', ('cleanup', 'output_retention_days'), _get_int, 10),
+    ('WA_CLEANUP_ENABLED', ('cleanup', 'enabled'), _get_bool, True),
+    ('WA_CLEANUP_MAX_REMOVALS', ('cleanup', 'max_removals_per_sweep'), _get_int, 1000),
+    ('WA_MAX_FINISHED_JOBS', ('cleanup', 'max_finished_jobs'), _get_int, 10000),
+    ('WA_PIPELINE_WORKERS', ('processing', 'pipeline_workers'), _get_int, 4),
+    ('WA_MAX_PENDING_JOBS', ('processing', 'max_pending_jobs'), _get_int, 20),
+    ('WA_SELINE_ENABLED', ('seline', 'enabled'), _get_bool, False),
+    ('WA_SELINE_TOKEN', ('seline', 'token'), _get_str, ''),
+    ('WA_PRESETS_FILE', ('presets_file',), _get_str, 'data/presets.yaml'),
+    # Internal nginx location mapped to output_path; when set, nginx sends output files itself
+    ('WA_ACCEL_REDIRECT_PREFIX', ('accel_redirect_prefix',), _get_str, ''),
+)
+
+
+@functools.lru_cache(maxsize=1)
 def load_config_from_env() -> dict:
     """
-    Load configuration from environment variables only.
+    Load configuration from environment variables only (see ENV_CONFIG_MAP).
     No YAML files, no complex merging - just pure environment variables with defaults.
+    The result is cached: the environment is parsed once per process.
     """
     # Load config/local-dev/.env file if present (for local development)
-    # Go up 3 levels from backend/api/app.py to repo root
-    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    local_dev_env_path = os.path.join(repo_root, 'config', 'local-dev', '.env')
-    load_dotenv(local_dev_env_path)
-    
-    config = {
-        'project': {
-            'name': os.getenv('WA_PROJECT_NAME', 'MyProject'),
-            'output_path': os.getenv('WA_OUTPUT_PATH', './data/output'),
-            'timezone': os.getenv('WA_TIMEZONE', 'UTC'),
-        },
-        'search': {
-            'radius_km': _get_float('WA_RADIUS_KM', 5.0),
-            'step_km': _get_float('WA_STEP_KM'),  # None = auto-calculate
-            'presets': _parse_semicolon_list(os.getenv('WA_PRESETS')),
-            'include': _parse_semicolon_list(os.getenv('WA_SEARCH_INCLUDE')),
-            'exclude': _parse_semicolon_list(os.getenv('WA_SEARCH_EXCLUDE')),
-        },
-        'overpass': {
-            'retries': _get_int('WA_OVERPASS_RETRIES', 5),
-            'batch_km': _get_float('WA_BATCH_KM', 50.0),
-            'servers': _parse_semicolon_list(
-                os.getenv('WA_OVERPASS_SERVERS'),
-                default=[
-                    'https://overpass.private.coffee/api/interpreter',
-                    'https://overpass-api.de/api/interpreter',
-                    'https://lz4.overpass-api.de/api/interpreter',
-                ]
-            ),
-        },
-        'map': {
-            'track_color': os.getenv('WA_TRACK_COLOR', 'blue'),
-            'default_marker_color': os.getenv('WA_DEFAULT_MARKER_COLOR', 'gray'),
-            'marker_color_palette': _parse_semicolon_list(
-                os.getenv('WA_MARKER_COLOR_PALETTE'),
-                default=['orange', 'purple', 'green', 'blue', 'darkred', 'darkblue', 'darkgreen', 'cadetblue', 'pink']
-            ),
-        },
-        'cleanup': {
-            'interval_seconds': _get_int('WA_CLEANUP_INTERVAL_SECONDS', 600),
-            'job_ttl_seconds': _get_int('WA_JOB_TTL_SECONDS', 21600),
-            'temp_file_max_age_seconds': _get_int('WA_TEMP_FILE_MAX_AGE_SECONDS', 3600),
-            'output_retention_days': _get_int('WA_OUTPUT_RETENTION_DAYS', 10),
-        },
-        'seline': {
-            'enabled': _get_bool('WA_SELINE_ENABLED', False),
-            'token': os.getenv('WA_SELINE_TOKEN', ''),
-        },
-        'presets_file': os.getenv('WA_PRESETS_FILE', 'data/presets.yaml'),
-    }
+    _load_local_dev_env()
+
+    config = {}
+    for env_key, path, parser, default in ENV_CONFIG_MAP:
+        section = config
+        for part in path[:-1]:
+            section = section.setdefault(part, {})
+        section[path[-1]] = parser(env_key, default)
     
     # Auto-calculate step_km if not set
     if config['search']['step_km'] is None:
@@ -167,17 +255,24 @@ def load_config_from_env() -> dict:
     
     # Ensure output path is absolute
     config['project']['output_path'] = os.path.abspath(config['project']['output_path'])
+    # Relative presets paths are resolved against the repo root (as run_pipeline does), once
+    config['presets_file'] = os.path.abspath(os.path.join(ROOT_DIR, config['presets_file']))
     
     return config
 
 
 # Load configuration once at startup
 APP_CONFIG = load_config_from_env()
+OUTPUT_PATH = APP_CONFIG['project']['output_path']  # Already absolute
+ACCEL_REDIRECT_PREFIX = APP_CONFIG['accel_redirect_prefix']
+if ACCEL_REDIRECT_PREFIX:
+    # send_from_directory then emits X-Sendfile without a body, see _x_accel_redirect
+    app.config['USE_X_SENDFILE'] = True
 
 # Ensure output directory exists on startup
 try:
-    os.makedirs(APP_CONFIG['project']['output_path'], exist_ok=True)
-    logger.info(f"Output directory ready: {APP_CONFIG['project']['output_path']}")
+    os.makedirs(OUTPUT_PATH, exist_ok=True)
+    logger.info(f"Output directory ready: {OUTPUT_PATH}")
 except Exception as e:
     logger.error(f"Failed to create output directory: {e}")
 
@@ -186,9 +281,29 @@ CLEANUP_INTERVAL_SECONDS = APP_CONFIG['cleanup']['interval_seconds']
 JOB_TTL_SECONDS = APP_CONFIG['cleanup']['job_ttl_seconds']
 TEMP_FILE_MAX_AGE_SECONDS = APP_CONFIG['cleanup']['temp_file_max_age_seconds']
 OUTPUT_RETENTION_DAYS = APP_CONFIG['cleanup']['output_retention_days']
+CLEANUP_ENABLED = APP_CONFIG['cleanup']['enabled']
+CLEANUP_MAX_REMOVALS = APP_CONFIG['cleanup']['max_removals_per_sweep']
+MAX_FINISHED_JOBS = APP_CONFIG['cleanup']['max_finished_jobs']
+OUTPUT_MAX_AGE_SECONDS = OUTPUT_RETENTION_DAYS * 86400
+
+# Bounded pool for pipeline runs: caps concurrent Overpass load and reuses threads across jobs.
+# The semaphore limits running + queued jobs; beyond that /api/process answers 503.
+# Threads rather than processes on purpose: runs mostly wait on Overpass, and spawn/forkserver
+# workers would re-execute this module's setup (cleanup threads, SocketIO) when started via
+# `python backend/api/app.py`. Keep the pipeline's number crunching in GIL-releasing
+# array calls (NumPy, pyproj, shapely) instead of per-element Python loops.
+pipeline_pool = ThreadPoolExecutor(
+    max_workers=APP_CONFIG['processing']['pipeline_workers'],
+    thread_name_prefix='pipeline',
+)
+pipeline_slots = threading.BoundedSemaphore(APP_CONFIG['processing']['max_pending_jobs'])
+
+# Ids of submitted jobs that no pipeline worker has picked up yet, oldest first
+queued_job_ids = []
+queued_job_ids_lock = threading.Lock()
 
 logger.info(f"Configuration loaded from environment variables")
-logger.info(f"  Output path: {APP_CONFIG['project']['output_path']}")
+logger.info(f"  Output path: {OUTPUT_PATH}")
 logger.info(f"  Presets file: {APP_CONFIG['presets_file']}")
 logger.info(f"  Radius: {APP_CONFIG['search']['radius_km']}km, Step: {APP_CONFIG['search']['step_km']}km")
 logger.info(f"  Cleanup: jobs={JOB_TTL_SECONDS}s, temp={TEMP_FILE_MAX_AGE_SECONDS}s, output={OUTPUT_RETENTION_DAYS}d")
@@ -198,49 +313,108 @@ logger.info(
     bool(APP_CONFIG.get('seline', {}).get('token')),
 )
 
-UUID_GPX_RE = re.compile(r'^[0-9a-fA-F-]{36}\.gpx$')
-UUID_OUTPUT_RE = re.compile(r'^[0-9a-fA-F-]{36}\.(xlsx|html)$')
+UPLOAD_SUFFIXES = ('.gpx',)
+OUTPUT_SUFFIXES = ('.xlsx', '.html', '.geojson')
+
+# Temp GPX uploads written by this process, checked on every cleanup tick. The
+# full upload folder scan (orphans, leftovers of previous runs) runs less often.
+temp_uploads = set()
+temp_uploads_lock = threading.Lock()
+TEMP_DIR_SWEEP_EVERY_TICKS = 10
+_temp_cleanup_ticks = 0
+
+# Only one worker process sweeps the shared temp/output directories (see _acquire_cleanup_lock)
+_owns_shared_cleanup = False
+_cleanup_lock_handle = None  # Kept open for the process lifetime to hold the flock
 
 
 def create_job(project_name: str):
     """Create a new job tracking entry."""
     job_id = str(uuid.uuid4())
-    with job_registry_lock:
-        job_registry[job_id] = {
-            'id': job_id,
-            'state': 'queued',  # queued, processing, completed, failed
-            'percent': 0,
-            'message': 'Queued for processing',
-            'project_name': project_name,
-            'created_at': datetime.now().isoformat(),
-            'excel_file': None,
-            'html_file': None,
-            'temp_gpx_path': None,
-            'rows_count': None,
-            'track_length_km': None,
-            'error': None,
-            'geojson': None,
-        }
+    job = {
+        'id': job_id,
+        'state': 'queued',  # queued, processing, completed, failed
+        'percent': 0,
+        'message': 'Queued for processing',
+        'project_name': project_name,
+        'created_at': datetime.now().isoformat(),
+        'created_ts': time.time(),  # Numeric copy of created_at for the cleanup sweep
+        'emitted_ts': 0.0,  # time.monotonic() of the last SocketIO progress emit
+        'emitted_percent': 0,  # percent sent with the last SocketIO progress emit
+        'excel_file': None,
+        'html_file': None,
+        'excel_etag': None,  # Content hashes computed once on completion, used as download ETags
+        'html_etag': None,
+        'temp_gpx_path': None,
+        'rows_count': None,
+        'track_length_km': None,
+        'error': None,
+        'geojson_file': None,  # Written once on completion next to the Excel/HTML outputs
+    }
+    # Lock first: update_job looks the lock up before the entry
+    job_locks[job_id] = threading.Lock()
+    job_registry[job_id] = job
+    if len(job_registry) > MAX_FINISHED_JOBS:
+        _evict_oldest_finished_jobs()
     return job_id
 
 
 def update_job(job_id: str, **kwargs):
     """Update job status."""
-    with job_registry_lock:
-        if job_id in job_registry:
-            job_registry[job_id].update(kwargs)
-            # Emit via SocketIO if available
-            if SOCKETIO_ENABLED and socketio:
-                try:
-                    socketio.emit('job_progress', job_registry[job_id], to=job_id, skip_sid=True)
-                except Exception as e:
-                    logger.debug(f"SocketIO emit failed: {e}")  # Non-blocking
+    lock = job_locks.get(job_id)
+    if lock is None:
+        return
+    with lock:
+        job = job_registry.get(job_id)
+        if job is None:
+            return
+        updated = {**job, **kwargs}
+        emit = False
+        if SOCKETIO_ENABLED and socketio:
+            now = time.monotonic()
+            if (
+                updated['state'] != job['state']
+                or updated['message'] != job['message']
+                or abs(updated['percent'] - job['emitted_percent']) >= 1
+            ):
+                emit = True
+            elif updated['percent'] != job['percent']:
+                # Throttle sub-percent ticks of chatty progress callbacks
+                emit = now - job['emitted_ts'] >= PROGRESS_EMIT_INTERVAL_SECONDS
+            if emit:
+                updated['emitted_ts'] = now
+                updated['emitted_percent'] = updated['percent']
+        job_registry[job_id] = updated
+        snapshot = public_job(updated) if emit else None
+    # Hand the snapshot to the emitter thread, pipeline threads never touch the engine.io write path
+    if emit:
+        emit_queue.put((job_id, snapshot))
+
+
+def _emitter_loop():
+    """Send queued job progress snapshots via SocketIO."""
+    while True:
+        job_id, snapshot = emit_queue.get()
+        try:
+            socketio.emit('job_progress', snapshot, to=job_id, skip_sid=True)
+        except Exception as e:
+            logger.debug(f"SocketIO emit failed: {e}")  # Non-blocking
+
+
+def public_job(job: dict) -> dict:
+    """Client-facing projection of a job entry."""
+    return {key: job[key] for key in STATUS_KEYS}
 
 
 def get_job(job_id: str):
-    """Get job status."""
-    with job_registry_lock:
-        return job_registry.get(job_id, None)
+    """Get a (read-only) snapshot of the job status."""
+    return job_registry.get(job_id)
+
+
+def _file_etag(path: str) -> str:
+    """SHA-256 of a file, used as a precomputed ETag for downloads."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
 
 
 def _safe_remove(path: str):
@@ -254,84 +428,203 @@ def _safe_remove(path: str):
         return False
 
 
+def _is_finished(job: dict) -> bool:
+    return job.get('state') in ('completed', 'failed')
+
+
+def _drop_job(job_id: str):
+    lock = job_locks.get(job_id)
+    if lock is None:
+        job_registry.pop(job_id, None)
+        return
+    # Per-job lock so a concurrent update_job cannot rebind the entry after it is removed
+    with lock:
+        job_registry.pop(job_id, None)
+        job_locks.pop(job_id, None)
+
+
 def _cleanup_job_registry(now_ts: float):
-    expired_ids = []
-    with job_registry_lock:
-        for job_id, job in job_registry.items():
-            created_at = job.get('created_at')
-            state = job.get('state')
-            if not created_at or state not in ('completed', 'failed'):
+    for job_id, job in list(job_registry.items()):
+        if not _is_finished(job):
+            continue
+        if now_ts - job['created_ts'] <= JOB_TTL_SECONDS:
+            continue
+        _drop_job(job_id)
+
+
+def _evict_oldest_finished_jobs():
+    """
+    Keep at most MAX_FINISHED_JOBS finished jobs, independent of the TTL sweep (which may
+    be disabled). The registry keeps insertion order, so the oldest jobs come first.
+    """
+    finished = [job_id for job_id, job in list(job_registry.items()) if _is_finished(job)]
+    excess = len(finished) - MAX_FINISHED_JOBS
+    if excess > 0:
+        for job_id in finished[:excess]:
+            _drop_job(job_id)
+        logger.info(f"Evicted {excess} finished jobs over the limit of {MAX_FINISHED_JOBS}")
+
+
+def _is_uuid_filename(name: str, suffixes: tuple) -> bool:
+    """Check for '<uuid><suffix>' names written by this app (suffix check first, then UUID parse)."""
+    stem, _, ext = name.rpartition('.')
+    if len(stem) != 36 or f'.{ext}' not in suffixes or stem.count('-') != 4:
+        return False
+    try:
+        uuid.UUID(stem)
+    except ValueError:
+        return False
+    return True
+
+
+def _track_temp_upload(path: str):
+    if not CLEANUP_ENABLED:
+        return  # Nothing would ever drain the set
+    with temp_uploads_lock:
+        temp_uploads.add(path)
+
+
+def _iter_expired_files(directory: str, suffixes: tuple, max_age_seconds: float, now_ts: float):
+    """Yield paths of '<uuid><suffix>' files in directory older than max_age_seconds."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            # Name and d_type come from the directory listing itself; only candidates get a stat call
+            if not name.endswith(suffixes) or not entry.is_file(follow_symlinks=False):
                 continue
             try:
-                created_ts = datetime.fromisoformat(created_at).timestamp()
-            except Exception:
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+            except FileNotFoundError:
                 continue
-            if now_ts - created_ts > JOB_TTL_SECONDS:
-                expired_ids.append(job_id)
+            # Validate the name only for expired entries
+            if now_ts - mtime > max_age_seconds and _is_uuid_filename(name, suffixes):
+                yield entry.path
 
-        for job_id in expired_ids:
-            job_registry.pop(job_id, None)
+
+def _remove_expired_files(directory: str, suffixes: tuple, max_age_seconds: float, now_ts: float):
+    """Remove expired files, at most CLEANUP_MAX_REMOVALS per sweep (the rest waits for the next tick)."""
+    expired = _iter_expired_files(directory, suffixes, max_age_seconds, now_ts)
+    for path in itertools.islice(expired, CLEANUP_MAX_REMOVALS):
+        _safe_remove(path)
 
 
 def _cleanup_temp_uploads(now_ts: float):
-    temp_dir = app.config.get('UPLOAD_FOLDER', tempfile.gettempdir())
+    global _temp_cleanup_ticks
     try:
-        for name in os.listdir(temp_dir):
-            if not UUID_GPX_RE.match(name):
-                continue
-            path = os.path.join(temp_dir, name)
+        # Full scan every Nth tick, catches orphans and uploads that were never tracked
+        if _owns_shared_cleanup and _temp_cleanup_ticks % TEMP_DIR_SWEEP_EVERY_TICKS == 0:
+            temp_dir = app.config.get('UPLOAD_FOLDER', tempfile.gettempdir())
+            _remove_expired_files(temp_dir, UPLOAD_SUFFIXES, TEMP_FILE_MAX_AGE_SECONDS, now_ts)
+        _temp_cleanup_ticks += 1
+
+        with temp_uploads_lock:
+            paths = list(temp_uploads)
+        for path in paths:
             try:
-                mtime = os.path.getmtime(path)
+                expired = now_ts - os.stat(path).st_mtime > TEMP_FILE_MAX_AGE_SECONDS
             except FileNotFoundError:
-                continue
-            if now_ts - mtime > TEMP_FILE_MAX_AGE_SECONDS:
+                expired = True  # Already removed by the pipeline
+            if expired:
                 _safe_remove(path)
+                with temp_uploads_lock:
+                    temp_uploads.discard(path)
     except Exception as e:
         logger.debug(f"Temp cleanup failed: {e}")
 
 
 def _cleanup_output_files(now_ts: float):
     try:
-        output_dir = APP_CONFIG['project']['output_path']
-        max_age_seconds = OUTPUT_RETENTION_DAYS * 86400
-
-        for name in os.listdir(output_dir):
-            if not UUID_OUTPUT_RE.match(name):
-                continue
-            path = os.path.join(output_dir, name)
-            try:
-                mtime = os.path.getmtime(path)
-            except FileNotFoundError:
-                continue
-            if now_ts - mtime > max_age_seconds:
-                _safe_remove(path)
+        _remove_expired_files(OUTPUT_PATH, OUTPUT_SUFFIXES, OUTPUT_MAX_AGE_SECONDS, now_ts)
     except Exception as e:
         logger.debug(f"Output cleanup failed: {e}")
 
 
-def _cleanup_loop():
-    while True:
-        time.sleep(CLEANUP_INTERVAL_SECONDS)
-        now_ts = time.time()
-        _cleanup_job_registry(now_ts)
-        _cleanup_temp_uploads(now_ts)
-        _cleanup_output_files(now_ts)
+def _acquire_cleanup_lock() -> bool:
+    """
+    Take a non-blocking flock on a sentinel file in the upload folder, so that with
+    several worker processes only one of them sweeps the shared directories.
+    """
+    global _cleanup_lock_handle
+    if fcntl is None:
+        return True
+    lock_path = os.path.join(app.config['UPLOAD_FOLDER'], 'whatsaround-cleanup.lock')
+    handle = open(lock_path, 'a')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    _cleanup_lock_handle = handle
+    return True
+
+
+def _run_periodically(task, interval_seconds: float):
+    """Run task(now_ts) every interval_seconds in its own daemon thread."""
+    def loop():
+        while True:
+            time.sleep(interval_seconds)
+            task(time.time())
 
+    thread = threading.Thread(target=loop, name=task.__name__.lstrip('_'), daemon=True)
+    thread.start()
+    return thread
 
-# Start background cleanup loop
-cleanup_thread = threading.Thread(target=_cleanup_loop, daemon=True)
-cleanup_thread.start()
+
+def start_cleanup():
+    """
+    Start the background cleanup jobs. Each sweep runs in its own thread so a slow
+    directory scan never delays job registry eviction.
+    """
+    global _owns_shared_cleanup
+    if not CLEANUP_ENABLED:
+        logger.info("Background cleanup disabled (WA_CLEANUP_ENABLED=false)")
+        return
+    _owns_shared_cleanup = _acquire_cleanup_lock()
+    # The job registry and tracked uploads are per process, so these always run
+    _run_periodically(_cleanup_job_registry, CLEANUP_INTERVAL_SECONDS)
+    _run_periodically(_cleanup_temp_uploads, CLEANUP_INTERVAL_SECONDS)
+    if _owns_shared_cleanup:
+        _run_periodically(_cleanup_output_files, CLEANUP_INTERVAL_SECONDS)
+    else:
+        logger.info("Cleanup lock held by another worker, skipping shared directory sweeps")
+
+
+start_cleanup()
+
+
+def _queue_message(position: int) -> str:
+    return f'Queued for processing (position {position})'
+
+
+def _enqueue_job(job_id: str):
+    with queued_job_ids_lock:
+        queued_job_ids.append(job_id)
+        update_job(job_id, message=_queue_message(len(queued_job_ids)))
+
+
+def _dequeue_job(job_id: str):
+    """Take a job off the wait list and move the jobs behind it up one position."""
+    with queued_job_ids_lock:
+        try:
+            idx = queued_job_ids.index(job_id)
+        except ValueError:
+            return
+        del queued_job_ids[idx]
+        for position, waiting_id in enumerate(queued_job_ids[idx:], start=idx + 1):
+            update_job(waiting_id, message=_queue_message(position))
 
 
 def process_gpx_async(job_id: str, config: dict, temp_gpx_path: str, form_presets, form_includes, form_excludes, marker_track_points=None):
     """Run pipeline in background thread."""
+    _dequeue_job(job_id)
+
     def on_progress(percent: float, message: str):
         update_job(job_id, state='processing', percent=int(percent), message=message)
 
     try:
-        # Generate UUIDs for output files (ensures unique names on disk)
-        excel_uuid = f"{uuid.uuid4()}.xlsx"
-        html_uuid = f"{uuid.uuid4()}.html"
+        # Output files are named after the job id (already a unique UUID)
+        excel_uuid = f"{job_id}.xlsx"
+        html_uuid = f"{job_id}.html"
         
         # Use marker track points if provided (marker mode), otherwise load from GPX
         if marker_track_points:
@@ -351,7 +644,11 @@ def process_gpx_async(job_id: str, config: dict, temp_gpx_path: str, form_preset
             html_filename=html_uuid,
             track_points_override=track_points,
         )
-        geojson = build_geojson(track_points, result.get('dataframe'))
+        # Encoded feature by feature straight to disk, the full FeatureCollection is never held in memory
+        geojson_file = f"{job_id}.geojson"
+        geojson_path = os.path.join(config['project']['output_path'], geojson_file)
+        with open(geojson_path, 'wb') as f:
+            f.writelines(iter_geojson(track_points, result.get('dataframe')))
         
         # Clean up temp GPX file if it exists
         if temp_gpx_path:
@@ -367,9 +664,11 @@ def process_gpx_async(job_id: str, config: dict, temp_gpx_path: str, form_preset
             message='Processing complete',
             excel_file=excel_uuid,
             html_file=html_uuid,
+            excel_etag=_file_etag(result['excel_path']),
+            html_etag=_file_etag(result['html_path']),
             rows_count=result['rows_count'],
             track_length_km=result['track_length_km'],
-            geojson=geojson,
+            geojson_file=geojson_file,
         )
     except Exception as e:
         logger.error(f"Processing failed for job {job_id}: {e}", exc_info=True)
@@ -382,51 +681,119 @@ def process_gpx_async(job_id: str, config: dict, temp_gpx_path: str, form_preset
         )
 
 
+def _on_pipeline_done(job_id: str, future):
+    """Release the pipeline slot and fail the job if process_gpx_async raised unexpectedly."""
+    pipeline_slots.release()
+    _dequeue_job(job_id)  # No-op unless the job never reached a worker (e.g. cancelled at shutdown)
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Pipeline worker crashed for job {job_id}: {error}")
+        update_job(job_id, state='failed', percent=0, message='Processing failed', error=str(error))
+
+
 def allowed_file(filename: str) -> bool:
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    # Only one extension is accepted, so compare the tail instead of splitting the name
+    return filename[-len(ALLOWED_EXTENSION):].lower() == ALLOWED_EXTENSION
+
+
+def parse_process_form(temp_gpx_path: str):
+    """
+    Stream the multipart body of /api/process without going through Werkzeug's form parser.
+    The uploaded file is written directly to temp_gpx_path; form fields are returned as a MultiDict.
+    """
+    parser = StreamingFormDataParser(headers=request.headers)
+    file_target = FileTarget(temp_gpx_path)
+    parser.register('file', file_target)
+    field_targets = {name: ListTarget(_type=str) for name in PROCESS_FORM_FIELDS}
+    for name, target in field_targets.items():
+        parser.register(name, target)
+
+    while chunk := request.stream.read(UPLOAD_CHUNK_SIZE):
+        parser.data_received(chunk)
+
+    form = MultiDict([(name, value) for name, target in field_targets.items() for value in target.value])
+    return form, file_target
+
+
+# DataFrame columns copied into POI feature properties, with the fallback used when a column is missing
+GEOJSON_POI_COLUMNS = (
+    ('Name', None),
+    ('Matching Filter', ''),
+    ('Kilometers from start', 0),
+    ('Distance from track (km)', 0),
+    ('Website', ''),
+    ('Phone', ''),
+    ('Opening hours', ''),
+    ('OSM Tags', ''),
+)
 
 
-def build_geojson(track_points, df):
-    features = []
+def _column_values(df, name: str, default) -> list:
+    return df[name].tolist() if name in df.columns else [default] * len(df)
+
+
+def iter_geojson(track_points, df):
+    """Yield the job's FeatureCollection as encoded JSON chunks, one feature at a time."""
+    yield b'{"type":"FeatureCollection","features":['
+    separator = b''
     if track_points:
-        features.append(
+        yield orjson.dumps(
             {
                 'type': 'Feature',
                 'geometry': {
                     'type': 'LineString',
-                    'coordinates': [(float(lon), float(lat)) for lon, lat in track_points],
+                    'coordinates': np.asarray(track_points, dtype=np.float64),
                 },
                 'properties': {'featureType': 'track'},
-            }
+            },
+            option=ORJSON_OPTIONS,
         )
+        separator = b','
 
-    if df is not None:
+    poi_rows = ()
+    if df is not None and not df.empty:
         try:
-            for _, row in df.iterrows():
-                lon = float(row.get('lon'))
-                lat = float(row.get('lat'))
-                features.append(
-                    {
-                        'type': 'Feature',
-                        'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
-                        'properties': {
-                            'featureType': 'poi',
-                            'id': row.get('Name') or '',
-                            'name': row.get('Name') or 'Unnamed',
-                            'matching_filter': row.get('Matching Filter', ''),
-                            'kilometers_from_start': row.get('Kilometers from start', 0),
-                            'distance_km': row.get('Distance from track (km)', 0),
-                            'website': row.get('Website', ''),
-                            'phone': row.get('Phone', ''),
-                            'opening_hours': row.get('Opening hours', ''),
-                            'tags': row.get('OSM Tags', ''),
-                        },
-                    }
-                )
+            # Pull whole columns once (SoA) instead of boxing every row into a Series or record dict
+            poi_rows = zip(
+                df['lon'].to_numpy(dtype=np.float64).tolist(),
+                df['lat'].to_numpy(dtype=np.float64).tolist(),
+                *(_column_values(df, name, default) for name, default in GEOJSON_POI_COLUMNS),
+            )
         except Exception as e:
             logger.warning(f"Failed to convert dataframe to GeoJSON: {e}")
 
-    return {'type': 'FeatureCollection', 'features': features}
+    for lon, lat, name, matching_filter, km_from_start, distance_km, website, phone, opening_hours, tags in poi_rows:
+        yield separator
+        yield orjson.dumps(
+            {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                'properties': {
+                    'featureType': 'poi',
+                    'id': name or '',
+                    'name': name or 'Unnamed',
+                    'matching_filter': matching_filter,
+                    'kilometers_from_start': km_from_start,
+                    'distance_km': distance_km,
+                    'website': website,
+                    'phone': phone,
+                    'opening_hours': opening_hours,
+                    'tags': tags_as_text(tags),
+                },
+            },
+            option=ORJSON_OPTIONS,
+        )
+        separator = b','
+    yield b']}'
+
+
+@app.after_request
+def _x_accel_redirect(response):
+    """Translate Flask's X-Sendfile into nginx's X-Accel-Redirect for the internal output location."""
+    path = response.headers.pop('X-Sendfile', None)
+    if path is not None:
+        response.headers['X-Accel-Redirect'] = f"{ACCEL_REDIRECT_PREFIX}{os.path.basename(path)}"
+    return response
 
 
 @app.route('/health', methods=['GET'])
@@ -434,28 +801,58 @@ def health_check():
     return jsonify({'status': 'healthy', 'service': 'WhatsAround'}), 200
 
 
+def _build_config_response() -> bytes:
+    presets = load_presets(APP_CONFIG['presets_file'])
+    return orjson.dumps({
+        'defaults': {
+            'project_name': APP_CONFIG['project']['name'],
+            'radius_km': APP_CONFIG['search']['radius_km'],
+            'step_km': APP_CONFIG['search']['step_km'],
+            'include': APP_CONFIG['search'].get('include', []),
+            'exclude': APP_CONFIG['search'].get('exclude', []),
+        },
+        'presets': list(presets.keys()),
+        'presets_detail': {name: p for name, p in presets.items()},
+        'marker_color_palette': APP_CONFIG['map'].get('marker_color_palette', []),
+        'default_marker_color': APP_CONFIG['map'].get('default_marker_color', 'gray'),
+        'track_color': APP_CONFIG['map'].get('track_color', 'blue'),
+        'seline': {
+            'enabled': bool(APP_CONFIG.get('seline', {}).get('enabled')),
+            'token': APP_CONFIG.get('seline', {}).get('token') if APP_CONFIG.get('seline', {}).get('enabled') else None,
+        },
+    }, option=ORJSON_OPTIONS)
+
+
+# (presets file mtime, serialized /api/config body), rebuilt only when presets.yaml changes
+_config_response = (None, None)
+
+
+def get_config_response() -> bytes:
+    """Serialized /api/config payload, cached until the presets file is modified."""
+    global _config_response
+    mtime = os.path.getmtime(APP_CONFIG['presets_file'])
+    cached_mtime, body = _config_response
+    if mtime != cached_mtime:
+        body = _build_config_response()
+        _config_response = (mtime, body)
+    return body
+
+
+# Build the payload once at startup so the first request doesn't pay for YAML parsing
+try:
+    get_config_response()
+except Exception as e:
+    logger.warning(f"Could not preload /api/config response: {e}")
+
+
 @app.route('/api/config', methods=['GET'])
 def get_config():
     try:
-        presets = load_presets(APP_CONFIG['presets_file'])
-        return jsonify({
-            'defaults': {
-                'project_name': APP_CONFIG['project']['name'],
-                'radius_km': APP_CONFIG['search']['radius_km'],
-                'step_km': APP_CONFIG['search']['step_km'],
-                'include': APP_CONFIG['search'].get('include', []),
-                'exclude': APP_CONFIG['search'].get('exclude', []),
-            },
-            'presets': list(presets.keys()),
-            'presets_detail': {name: p for name, p in presets.items()},
-            'marker_color_palette': APP_CONFIG['map'].get('marker_color_palette', []),
-            'default_marker_color': APP_CONFIG['map'].get('default_marker_color', 'gray'),
-            'track_color': APP_CONFIG['map'].get('track_color', 'blue'),
-            'seline': {
-                'enabled': bool(APP_CONFIG.get('seline', {}).get('enabled')),
-                'token': APP_CONFIG.get('seline', {}).get('token') if APP_CONFIG.get('seline', {}).get('enabled') else None,
-            },
-        }), 200
+        return Response(
+            get_config_response(),
+            mimetype='application/json',
+            headers={'Cache-Control': 'public, max-age=300'},
+        )
     except Exception as e:
         logger.error(f"Config fetch failed: {e}")
         return jsonify({'error': str(e)}), 500
@@ -467,7 +864,7 @@ def get_status(job_id: str):
         job = get_job(job_id)
         if not job:
             return jsonify({'error': 'Job not found'}), 404
-        return jsonify(job), 200
+        return jsonify(public_job(job)), 200
     except Exception as e:
         logger.error(f"Status fetch failed: {e}")
         return jsonify({'error': str(e)}), 500
@@ -475,13 +872,29 @@ def get_status(job_id: str):
 
 @app.route('/api/process', methods=['POST'])
 def process_gpx():
+    temp_gpx_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4()}.gpx")
     try:
+        try:
+            form, file_target = parse_process_form(temp_gpx_path)
+        except ParseFailedException as e:
+            _safe_remove(temp_gpx_path)
+            return jsonify({'error': f'Invalid form data: {e}'}), 400
+        except ClientDisconnected:
+            _safe_remove(temp_gpx_path)
+            return jsonify({'error': 'Upload interrupted'}), 400
+        except BaseException:
+            # Includes RequestEntityTooLarge: request.stream enforces MAX_CONTENT_LENGTH
+            # up front and while reading (chunked bodies). Never leave a partial upload.
+            _safe_remove(temp_gpx_path)
+            raise
+
         # Check if this is marker mode or GPX file mode
-        marker_lat = request.form.get('marker_lat')
-        marker_lon = request.form.get('marker_lon')
+        marker_lat = form.get('marker_lat')
+        marker_lon = form.get('marker_lon')
         
         if marker_lat and marker_lon:
             # Marker mode - create single-point track
+            _safe_remove(temp_gpx_path)
             temp_gpx_path = None
             try:
                 lat = float(marker_lat)
@@ -490,34 +903,33 @@ def process_gpx():
             except (ValueError, TypeError):
                 return jsonify({'error': 'Invalid marker coordinates'}), 400
         else:
-            # GPX file mode
-            if 'file' not in request.files:
+            # GPX file mode (file was already streamed to temp_gpx_path during parsing)
+            if file_target.multipart_filename is None:
+                _safe_remove(temp_gpx_path)
                 return jsonify({'error': 'No file provided'}), 400
-            file = request.files['file']
-            if file.filename == '':
+            if file_target.multipart_filename == '':
+                _safe_remove(temp_gpx_path)
                 return jsonify({'error': 'Empty filename'}), 400
-            if not allowed_file(file.filename):
+            if not allowed_file(file_target.multipart_filename):
+                _safe_remove(temp_gpx_path)
                 return jsonify({'error': 'Only .gpx files allowed'}), 400
-            # Use UUID to ensure unique temp filename (avoid collisions)
-            temp_filename = f"{uuid.uuid4()}.gpx"
-            temp_gpx_path = os.path.join(app.config['UPLOAD_FOLDER'], temp_filename)
-            file.save(temp_gpx_path)
+            _track_temp_upload(temp_gpx_path)
             logger.info(f"Processing GPX: {temp_gpx_path}")
             track_points = None  # Will be loaded in process_gpx_async
         
         # Build config from APP_CONFIG (environment variables)
         config = {
             'project': {
-                'name': request.form.get('project_name', APP_CONFIG['project']['name']),
-                'output_path': APP_CONFIG['project']['output_path'],
+                'name': form.get('project_name', APP_CONFIG['project']['name']),
+                'output_path': OUTPUT_PATH,
                 'timezone': APP_CONFIG['project']['timezone'],
             },
             'input': {
                 'gpx_file': temp_gpx_path,
             },
             'search': {
-                'radius_km': float(request.form.get('radius_km', APP_CONFIG['search']['radius_km'])),
-                'step_km': float(request.form.get('step_km')) if 'step_km' in request.form else APP_CONFIG['search']['step_km'],
+                'radius_km': float(form.get('radius_km', APP_CONFIG['search']['radius_km'])),
+                'step_km': float(form.get('step_km')) if 'step_km' in form else APP_CONFIG['search']['step_km'],
                 'include': APP_CONFIG['search']['include'],
                 'exclude': APP_CONFIG['search']['exclude'],
             },
@@ -529,77 +941,92 @@ def process_gpx():
         if config['search']['step_km'] is None:
             config['search']['step_km'] = config['search']['radius_km'] * 0.6
         
-        form_presets = request.form.getlist('preset') if 'preset' in request.form else None
-        form_includes = request.form.getlist('include') if 'include' in request.form else None
-        form_excludes = request.form.getlist('exclude') if 'exclude' in request.form else None
+        form_presets = form.getlist('preset') if 'preset' in form else None
+        form_includes = form.getlist('include') if 'include' in form else None
+        form_excludes = form.getlist('exclude') if 'exclude' in form else None
         
-        os.makedirs(config['project']['output_path'], exist_ok=True)
-        job_id = create_job(config['project']['name'])
-        update_job(job_id, temp_gpx_path=temp_gpx_path)
-        thread = threading.Thread(
-            target=process_gpx_async,
-            args=(job_id, config, temp_gpx_path, form_presets, form_includes, form_excludes, track_points if marker_lat and marker_lon else None),
-            daemon=True,
-        )
-        thread.start()
+        if not pipeline_slots.acquire(blocking=False):
+            if temp_gpx_path:
+                _safe_remove(temp_gpx_path)
+            return jsonify({'error': 'Server busy, please try again later'}), 503
+        # From here on the slot is released by _on_pipeline_done; until that callback is
+        # registered, any failure has to give the slot back itself
+        job_id = None
+        callback_registered = False
+        try:
+            job_id = create_job(config['project']['name'])
+            update_job(job_id, temp_gpx_path=temp_gpx_path)
+            _enqueue_job(job_id)  # Before submit, so a worker that starts right away finds the entry
+            future = pipeline_pool.submit(
+                process_gpx_async,
+                job_id, config, temp_gpx_path, form_presets, form_includes, form_excludes,
+                track_points if marker_lat and marker_lon else None,
+            )
+            future.add_done_callback(lambda f: _on_pipeline_done(job_id, f))
+            callback_registered = True
+        except BaseException as e:
+            if not callback_registered:
+                if job_id is not None:
+                    _dequeue_job(job_id)
+                    update_job(job_id, state='failed', percent=0, message='Processing failed', error=str(e))
+                pipeline_slots.release()
+                if temp_gpx_path:
+                    _safe_remove(temp_gpx_path)
+            raise
         return jsonify({'job_id': job_id, 'status_url': f'/api/status/{job_id}'}), 202
+    except RequestEntityTooLarge:
+        raise  # Answered by the 413 error handler
     except Exception as e:
         logger.error(f"Processing failed: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/download/excel/<job_id>', methods=['GET'])
-def download_excel(job_id):
+# Download kinds: (file extension, label for messages, send as attachment). The job entry
+# holds '<kind>_file' and '<kind>_etag' for each.
+OUTPUT_KINDS = {
+    'excel': ('xlsx', 'Excel', True),
+    'html': ('html', 'HTML', False),
+}
+
+
+def _send_output(job_id: str, kind: str):
+    """Send a job's output file under a clean '<project name>.<ext>' download name."""
+    ext, label, as_attachment = OUTPUT_KINDS[kind]
     try:
         job = get_job(job_id)
         if not job:
             return jsonify({'error': 'Job not found'}), 404
-        
-        excel_uuid = job.get('excel_file')
-        if not excel_uuid:
-            return jsonify({'error': 'Excel file not available'}), 404
-        
-        output_dir = APP_CONFIG['project']['output_path']
-        file_path = os.path.join(output_dir, secure_filename(excel_uuid))
-        logger.info(f"Download Excel requested for job {job_id}: {file_path}")
-        
-        if not os.path.exists(file_path):
-            return jsonify({'error': 'File not found'}), 404
-        
-        # Download with clean project name
+
+        filename = job.get(f'{kind}_file')
+        if not filename:
+            return jsonify({'error': f'{label} file not available'}), 404
+
+        logger.info(f"Download {label} requested for job {job_id}: {filename}")
         project_name = job.get('project_name', 'download')
-        clean_download_name = f"{project_name}.xlsx"
-        return send_file(file_path, as_attachment=True, download_name=clean_download_name)
+        # filename is server-generated ('<job_id>.<ext>'); send_from_directory still safe-joins it
+        return send_from_directory(
+            OUTPUT_PATH,
+            filename,
+            as_attachment=as_attachment,
+            download_name=f"{project_name}.{ext}",
+            conditional=True,
+            etag=job.get(f'{kind}_etag') or True,
+        )
+    except NotFound:
+        return jsonify({'error': 'File not found'}), 404
     except Exception as e:
         logger.error(f"Download failed: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/download/excel/<job_id>', methods=['GET'])
+def download_excel(job_id):
+    return _send_output(job_id, 'excel')
+
+
 @app.route('/api/download/html/<job_id>', methods=['GET'])
 def download_html(job_id):
-    try:
-        job = get_job(job_id)
-        if not job:
-            return jsonify({'error': 'Job not found'}), 404
-        
-        html_uuid = job.get('html_file')
-        if not html_uuid:
-            return jsonify({'error': 'HTML file not available'}), 404
-        
-        output_dir = APP_CONFIG['project']['output_path']
-        file_path = os.path.join(output_dir, secure_filename(html_uuid))
-        logger.info(f"Download HTML requested for job {job_id}: {file_path}")
-        
-        if not os.path.exists(file_path):
-            return jsonify({'error': 'File not found'}), 404
-        
-        # Download with clean project name
-        project_name = job.get('project_name', 'download')
-        clean_download_name = f"{project_name}.html"
-        return send_file(file_path, as_attachment=False, download_name=clean_download_name)
-    except Exception as e:
-        logger.error(f"Download failed: {e}")
-        return jsonify({'error': str(e)}), 500
+    return _send_output(job_id, 'html')
 
 
 @app.route('/api/job/<job_id>/geojson', methods=['GET'])
@@ -607,12 +1034,22 @@ def get_geojson(job_id: str):
     job = get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
-    if not job.get('geojson'):
+    if not job.get('geojson_file'):
         return jsonify({'error': 'GeoJSON not available yet'}), 404
-    return jsonify(job['geojson'])
+    # Written once when the job completed; never changes afterwards
+    return send_from_directory(
+        OUTPUT_PATH,
+        job['geojson_file'],
+        mimetype='application/geo+json',
+        conditional=True,
+        max_age=JOB_TTL_SECONDS,
+    )
 
 
 if SOCKETIO_ENABLED and socketio:
+    emitter_thread = threading.Thread(target=_emitter_loop, name='socketio_emitter', daemon=True)
+    emitter_thread.start()
+
     @socketio.on('connect')
     def handle_connect():
         logger.info(f"Client connected: {request.sid}")
@@ -633,7 +1070,7 @@ if SOCKETIO_ENABLED and socketio:
             logger.info(f"Client {request.sid} subscribed to job {job_id}")
             job = get_job(job_id)
             if job:
-                emit('job_progress', job)
+                emit('job_progress', public_job(job))
         except Exception as e:
             logger.error(f"Subscribe error: {e}", exc_info=True)
             emit('error', {'message': str(e)})
@@ -641,7 +1078,8 @@ if SOCKETIO_ENABLED and socketio:
 
 @app.errorhandler(413)
 def request_entity_too_large(error):
-    return jsonify({'error': 'File too large (max 50MB)'}), 413
+    max_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({'error': f'File too large (max {max_mb}MB)'}), 413
 
 
 @app.errorhandler(404)
@@ -0,0 +1,24 @@
+"""
+Gunicorn settings for the production backend image.
+Run from the repo root: gunicorn -c backend/api/gunicorn.conf.py backend.api.app:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', '5000')}"
+
+# One process: jobs live in the in-memory registry and SocketIO rooms are per process,
+# so a second worker would not know about jobs started on the first one.
+workers = 1
+
+# SocketIO runs in threading mode; each open WebSocket holds one thread.
+worker_class = "gthread"
+threads = int(os.getenv("WA_GUNICORN_THREADS", "100"))
+
+# Long-running pipeline jobs run on pipeline_pool, not in request threads
+timeout = 120
+graceful_timeout = 30
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("WA_GUNICORN_LOG_LEVEL", "info")
@@ -62,4 +62,10 @@ def parse_cli_args():
         help="Preset name from presets.yaml. Can be used multiple times.",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Query Overpass even if WA_OVERPASS_CACHE_DIR holds cached responses",
+    )
+
     return parser.parse_args()
@@ -1,5 +1,22 @@
 import os
 
+try:
+    import xlsxwriter  # noqa: F401  # Faster writer; openpyxl remains the fallback
+    EXCEL_ENGINE = "xlsxwriter"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+
+def tags_as_text(tags) -> str:
+    """Render one "OSM Tags" cell the way it appears in Excel/GeoJSON (dicts are stored raw)."""
+    return str(tags)
+
+
+def _with_text_tags(df):
+    if 'OSM Tags' in df.columns:
+        df['OSM Tags'] = df['OSM Tags'].map(tags_as_text).astype("str")
+    return df
+
 
 def export_to_excel(df, output_path: str, project_name: str, filename: str = None, track_points: list = None) -> str:
     """
@@ -28,7 +45,61 @@ def export_to_excel(df, output_path: str, project_name: str, filename: str = Non
     if track_points and len(track_points) < 2:
         if 'Kilometers from start' in export_df.columns:
             export_df = export_df.drop(columns=['Kilometers from start'])
+    export_df = _with_text_tags(export_df)
     
     excel_path = os.path.join(output_path, filename)
-    export_df.to_excel(excel_path, index=False)
+    if EXCEL_ENGINE == "xlsxwriter":
+        _write_xlsx_rows(export_df, excel_path)
+    else:
+        export_df.to_excel(excel_path, index=False, engine=EXCEL_ENGINE, freeze_panes=(1, 0))
     return excel_path
+
+
+def _write_xlsx_rows(df, excel_path: str) -> None:
+    """
+    Stream the frame into an xlsx file row by row with xlsxwriter's constant_memory mode.
+    pandas writes the body column by column, which constant_memory cannot take, so the rows
+    are fed directly. Layout follows df.to_excel(index=False, freeze_panes=(1, 0)), with
+    pandas' classic bold, bordered header cells.
+    """
+    workbook = xlsxwriter.Workbook(excel_path, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet('Sheet1')
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+        worksheet.freeze_panes(1, 0)
+
+        # Missing values become blank cells, as with pandas; xlsxwriter rejects NaN numbers
+        columns = [df[c].astype(object).where(df[c].notna(), None).tolist() for c in df.columns]
+        for row_idx, row in enumerate(zip(*columns), start=1):
+            worksheet.write_row(row_idx, 0, row)
+    finally:
+        workbook.close()
+
+
+def export_to_parquet(df, output_path: str, filename: str) -> str:
+    """
+    Write the POI DataFrame as a zstd-compressed Parquet file (requires pyarrow).
+    Reloads much faster than the Excel file, e.g. to re-render the map.
+    "OSM Tags" is stored as a map<string, string> column rather than as text.
+
+    Returns:
+        Full path to the exported Parquet file
+    """
+    os.makedirs(output_path, exist_ok=True)
+    if not filename.endswith('.parquet'):
+        filename = f"{filename}.parquet"
+
+    parquet_path = os.path.join(output_path, filename)
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df.drop(columns=['OSM Tags'], errors='ignore'), preserve_index=False)
+    if 'OSM Tags' in df.columns:
+        tags = pa.array(
+            [list(t.items()) if isinstance(t, dict) else None for t in df['OSM Tags'].tolist()],
+            type=pa.map_(pa.string(), pa.string()),
+        )
+        table = table.add_column(df.columns.get_loc('OSM Tags'), 'OSM Tags', tags)
+    pq.write_table(table, parquet_path, compression="zstd")
+    return parquet_path
@@ -1,8 +1,11 @@
 import logging
-from shapely.geometry import LineString
-from pyproj import Transformer, Geod
+from collections import defaultdict
+from pyproj import Geod
+import numpy as np
 import pandas as pd
 
+from backend.core.gpx_processing import nearest_track_positions
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,26 +25,34 @@ def filter_elements_and_build_rows(
     """
     Apply exclusion filters, calculate distance to track, identify matching filter, and build DataFrame.
     """
-    transformer = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
-    track_points_m = [transformer.transform(*p) for p in track_points]
-    total_track_length_km = track_info["total_length_km"]
-
-    if len(track_points_m) >= 2:
-        track_line = LineString(track_points_m)
-        track_length_m_proj = track_line.length
-    else:
-        track_line = None
-        track_length_m_proj = 0.0
+    # Contiguous float64 arrays (from compute_track_metrics) for nearest_track_positions
+    track_lons, track_lats, distances_km = track_info["lons"], track_info["lats"], track_info["distances_km"]
 
     # Use geodesic calculations for accurate distance measurements
     geod = Geod(ellps="WGS84")
 
-    parsed_excludes = [parse_filter(f) for f in exclude_filters]
-    parsed_includes = [parse_filter(f) for f in (include_filters or [])]
+    # key -> forbidden values, so each element only probes the keys it actually has
+    exclude_map = defaultdict(set)
+    for f in exclude_filters:
+        key, value = parse_filter(f)
+        exclude_map[key].add(value)
 
-    rows = []
+    # key -> {value: (rank, "key=value")}; the lowest rank wins like the ordered include list
+    include_map = defaultdict(dict)
+    for rank, f in enumerate(include_filters or []):
+        key, value = parse_filter(f)
+        include_map[key].setdefault(value, (rank, f"{key}={value}"))
+
+    # First pass: drop repeated OSM objects, elements without coordinates or hit by an exclusion filter
+    candidates = []
+    seen_osm = set()
 
     for el in elements:
+        osm_key = (el.get("type"), el["id"])
+        if osm_key in seen_osm:
+            continue
+        seen_osm.add(osm_key)
+
         lat2 = el.get("lat") or el.get("center", {}).get("lat")
         lon2 = el.get("lon") or el.get("center", {}).get("lon")
         if lat2 is None or lon2 is None:
@@ -50,15 +61,47 @@ def filter_elements_and_build_rows(
         tags = el.get("tags", {})
 
         # Exclusion filters
-        exclude_hit = False
-        for key, value in parsed_excludes:
-            if tags.get(key) == value:
-                exclude_hit = True
-                break
-        if exclude_hit:
+        if any(tags[key] in exclude_map[key] for key in tags.keys() & exclude_map.keys()):
             continue
 
-        name = tags.get("name", "Unnamed")
+        candidates.append((tags, lat2, lon2))
+
+    # Closest track point and its position along the track for all candidates at once (geodesic distance),
+    # then a boolean radius mask so only surviving candidates are touched in Python
+    radius_m = radius_km * 1000
+    candidate_lons = np.fromiter((c[2] for c in candidates), dtype=np.float64, count=len(candidates))
+    candidate_lats = np.fromiter((c[1] for c in candidates), dtype=np.float64, count=len(candidates))
+    if candidates:
+        min_distances_m, closest_positions_km = nearest_track_positions(
+            geod,
+            track_lons,
+            track_lats,
+            distances_km,
+            candidate_lons,
+            candidate_lats,
+            max_distance_m=radius_m,
+        )
+        within = np.flatnonzero(min_distances_m <= radius_m)
+    else:
+        min_distances_m = closest_positions_km = np.empty(0, dtype=np.float64)
+        within = np.empty(0, dtype=np.intp)
+
+    # Numeric columns are rounded and gathered as whole arrays; the loop only handles tags
+    km_from_start = np.round(closest_positions_km[within], 2)
+    distance_km = np.round(min_distances_m[within] / 1000, 2)
+    poi_lats = candidate_lats[within]
+    poi_lons = candidate_lons[within]
+
+    # Parallel column lists, turned into typed DataFrame columns at the end
+    matching_filters = []
+    names = []
+    websites = []
+    phones = []
+    opening_hours_list = []
+    osm_tags = []
+
+    for idx in within.tolist():
+        tags = candidates[idx][0]
 
         website = (
             tags.get("website")
@@ -74,69 +117,37 @@ def filter_elements_and_build_rows(
             or ""
         )
 
-        opening_hours = tags.get("opening_hours", "")
-
-        # Calculate minimum distance to any segment and position along track using geodesic distance
-        min_distance_m = float('inf')
-        cumulative_distance_km = 0
-        closest_position_km = 0
-
-        if len(track_points) < 2:
-            p_lon, p_lat = track_points[0]
-            _, _, min_distance_m = geod.inv(lon2, lat2, p_lon, p_lat)
-            closest_position_km = 0
-        else:
-            for i in range(len(track_points) - 1):
-                p1_lon, p1_lat = track_points[i]
-                p2_lon, p2_lat = track_points[i + 1]
-                
-                # Distance from POI to start of segment
-                _, _, dist_to_p1 = geod.inv(lon2, lat2, p1_lon, p1_lat)
-                
-                # Distance from POI to end of segment
-                _, _, dist_to_p2 = geod.inv(lon2, lat2, p2_lon, p2_lat)
-                
-                # Distance of this segment
-                _, _, segment_length = geod.inv(p1_lon, p1_lat, p2_lon, p2_lat)
-                
-                # Find closest point on this segment
-                if dist_to_p1 < min_distance_m:
-                    min_distance_m = dist_to_p1
-                    closest_position_km = cumulative_distance_km
-                
-                if dist_to_p2 < min_distance_m:
-                    min_distance_m = dist_to_p2
-                    closest_position_km = cumulative_distance_km + segment_length / 1000
-                
-                cumulative_distance_km += segment_length / 1000
-
-        if min_distance_m > radius_km * 1000:
-            continue
-
         # Identify which include filter matched
-        matching_filter = ""
-        for inc_key, inc_value in parsed_includes:
-            if tags.get(inc_key) == inc_value:
-                matching_filter = f"{inc_key}={inc_value}"
-                break
-
-        rows.append(
-            {
-                "Kilometers from start": round(closest_position_km, 2),
-                "Distance from track (km)": round(min_distance_m / 1000, 2),
-                "Matching Filter": matching_filter,
-                "Name": name,
-                "Website": website,
-                "Phone": phone,
-                "Opening hours": opening_hours,
-                "OSM Tags": str(tags),
-                "lat": lat2,
-                "lon": lon2
-            }
-        )
-
-    df = pd.DataFrame(rows).drop_duplicates()
+        include_hits = [
+            include_map[key][tags[key]]
+            for key in tags.keys() & include_map.keys()
+            if tags[key] in include_map[key]
+        ]
+
+        matching_filters.append(min(include_hits)[1] if include_hits else "")
+        names.append(tags.get("name", "Unnamed"))
+        websites.append(website)
+        phones.append(phone)
+        opening_hours_list.append(tags.get("opening_hours", ""))
+        osm_tags.append(tags)
+
+    # km values stay float64: float32 would show up as 0.5400000214576721 in Excel and GeoJSON.
+    # "OSM Tags" keeps the raw tag dicts; the exporters turn them into text (see export.tags_as_text).
+    df = pd.DataFrame(
+        {
+            "Kilometers from start": km_from_start,
+            "Distance from track (km)": distance_km,
+            "Matching Filter": pd.Categorical(matching_filters),
+            "Name": pd.array(names, dtype="str"),
+            "Website": pd.array(websites, dtype="str"),
+            "Phone": pd.array(phones, dtype="str"),
+            "Opening hours": pd.array(opening_hours_list, dtype="str"),
+            "OSM Tags": pd.array(osm_tags, dtype=object),
+            "lat": poi_lats,
+            "lon": poi_lons,
+        }
+    )
     if not df.empty:
         df.sort_values("Kilometers from start", inplace=True)
 
-    return rows, df
+    return df
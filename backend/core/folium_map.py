@@ -1,38 +1,68 @@
 import os
+import html
 import json
 import folium
+import numpy as np
+import pandas as pd
 from string import Template
 from folium.plugins import LocateControl
 
 
-def add_cdn_integrity(html_path: str) -> None:
-    try:
-        with open(html_path, "r", encoding="utf-8") as handle:
-            html = handle.read()
-    except OSError:
-        return
+def add_cdn_integrity(html: str) -> str:
+    """Add the SRI hash to folium's jQuery <script> tag in the rendered page."""
     jquery_src = "https://code.jquery.com/jquery-3.7.1.min.js"
     jquery_tag = f'<script src="{jquery_src}"></script>'
     jquery_sri = "sha256-/JqT3SQfawRcv/BIHPThkBvs0OEvtFFmqPF/lYI/Cxo="
     jquery_tag_with_sri = (
         f'<script src="{jquery_src}" integrity="{jquery_sri}" crossorigin="anonymous"></script>'
     )
+    return html.replace(jquery_tag, jquery_tag_with_sri)
 
-    if jquery_tag not in html:
-        return
 
-    updated_html = html.replace(jquery_tag, jquery_tag_with_sri)
-    if updated_html == html:
-        return
+# Adds all POI markers to the POI feature group from one embedded array of
+# [lat, lon, icon index, popup HTML] rows; one shared L.divIcon per marker color
+POI_MARKERS_TEMPLATE = Template("""
+    <script>
+        (function() {
+            var groupName = "$group_name";
+            var iconHtml = $icon_html;
+            var iconClasses = $icon_classes;
+            var pois = $pois;
+            var attempts = 0;
+            function attach() {
+                var group = window[groupName];
+                if (!group) {
+                    if (attempts++ < 50) return setTimeout(attach, 100);
+                    return;
+                }
 
-    try:
-        with open(html_path, "w", encoding="utf-8") as handle:
-            handle.write(updated_html)
-    except OSError:
-        return
+                var icons = iconClasses.map(function(cls) {
+                    return L.divIcon({
+                        html: iconHtml,
+                        iconSize: [32, 44],
+                        iconAnchor: [16, 42],
+                        className: 'wa-svg-marker ' + cls
+                    });
+                });
+                for (var i = 0; i < pois.length; i++) {
+                    var p = pois[i];
+                    L.marker([p[0], p[1]], { icon: icons[p[2]] })
+                        .bindPopup(p[3], { maxWidth: 300 })
+                        .addTo(group);
+                }
+            }
+            attach();
+        })();
+    </script>
+""")
 
 
-def build_svg_icon(color: str, kind: str = "poi") -> folium.DivIcon:
+def _script_json(value) -> str:
+    """JSON for embedding in a <script> block ('</' cannot close the tag)."""
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def build_svg_icon_html(color: str, kind: str = "poi") -> str:
     if kind == "start":
         circle_fill = "#16a34a"
         inner = '<polygon points="12,8 22,14 12,20" fill="#ffffff" />'
@@ -50,7 +80,40 @@ def build_svg_icon(color: str, kind: str = "poi") -> folium.DivIcon:
         {inner}
     </svg>
     """.strip()
-    return folium.DivIcon(html=svg, icon_size=(32, 44), icon_anchor=(16, 42), class_name="wa-svg-marker")
+    return svg
+
+
+def build_svg_icon(color: str, kind: str = "poi") -> folium.DivIcon:
+    return folium.DivIcon(
+        html=build_svg_icon_html(color, kind), icon_size=(32, 44), icon_anchor=(16, 42), class_name="wa-svg-marker"
+    )
+
+
+def build_popup_html(df, is_marker_mode: bool) -> list:
+    """
+    Build the popup HTML for every POI row with column-wise string concatenation.
+    OSM text values are HTML-escaped; the kilometers line is omitted in marker mode.
+    """
+    def escaped(column):
+        return df[column].astype(str).map(html.escape)
+
+    distance_from_start_html = (
+        "" if is_marker_mode
+        else "<b>Kilometers from start:</b> " + df["Kilometers from start"].astype(str) + "<br>"
+    )
+    matching_filter = escaped("Matching Filter") if "Matching Filter" in df.columns else "N/A"
+    website = escaped("Website")
+
+    popups = (
+        "<b>" + escaped("Name") + "</b><br>"
+        + distance_from_start_html
+        + "<b>Distance from track:</b> " + df["Distance from track (km)"].astype(str) + " km<br>"
+        + "<b>Filter:</b> " + matching_filter + "<br>"
+        + '<b>Website:</b> <a href="' + website + '" target="_blank">' + website + "</a><br>"
+        + "<b>Phone:</b> " + escaped("Phone") + "<br>"
+        + "<b>Opening hours:</b> " + escaped("Opening hours")
+    )
+    return popups.tolist()
 
 
 def build_folium_map(
@@ -136,8 +199,15 @@ def build_folium_map(
     LocateControl(position="topleft").add_to(m)
 
     # Add recenter control to fit track + POI bounds (when data exists)
-    track_latlon = [[lat, lon] for lon, lat in track_points] if track_points else []
-    poi_latlon = [[row["lat"], row["lon"]] for _, row in (df.iterrows() if df is not None else [])]
+    # [lat, lon] pairs built once and reused for the recenter control, the polyline and the bounds
+    track_latlon = np.asarray(track_points, dtype=np.float64).reshape(-1, 2)[:, ::-1].tolist()
+    # Pull POI columns once instead of boxing every row into a Series
+    if df is not None and not df.empty:
+        poi_lats = df["lat"].tolist()
+        poi_lons = df["lon"].tolist()
+    else:
+        poi_lats, poi_lons = [], []
+    poi_latlon = [[lat, lon] for lat, lon in zip(poi_lats, poi_lons)]
     recenter_style = """
     <style>
         .leaflet-bar.folium-recenter-control {
@@ -234,7 +304,7 @@ def build_folium_map(
     poi_group = folium.FeatureGroup(name="Points of Interest", overlay=True, show=True)
 
     folium.PolyLine(
-        [(lat, lon) for lon, lat in track_points],
+        track_latlon,
         color=map_cfg.get("track_color", "blue"),
         weight=3,
         opacity=0.8,
@@ -259,7 +329,7 @@ def build_folium_map(
         ).add_to(track_group)
 
     # Collect bounds from track and POIs for initial auto-fit
-    bounds = [[lat, lon] for lon, lat in track_points] if track_points else []
+    bounds = list(track_latlon)
 
     # Detect marker mode (single-point track)
     is_marker_mode = len(track_points) < 2
@@ -274,27 +344,36 @@ def build_folium_map(
             color = color_palette[idx % len(color_palette)] if color_palette else default_color
             filter_to_color[filt] = color
 
-    for _, row in df.iterrows():
-        bounds.append([row["lat"], row["lon"]])
-        # Build popup HTML conditionally based on track mode
-        distance_from_start_html = "" if is_marker_mode else f"<b>Kilometers from start:</b> {row['Kilometers from start']}<br>"
-        popup_html = f"""
-        <b>{row['Name']}</b><br>
-        {distance_from_start_html}<b>Distance from track:</b> {row['Distance from track (km)']} km<br>
-        <b>Filter:</b> {row.get('Matching Filter', 'N/A')}<br>
-        <b>Website:</b> <a href="{row['Website']}" target="_blank">{row['Website']}</a><br>
-        <b>Phone:</b> {row['Phone']}<br>
-        <b>Opening hours:</b> {row['Opening hours']}
-        """
-
-        matching_filter = row.get("Matching Filter", "")
-        color = filter_to_color.get(matching_filter, default_color)
-
-        folium.Marker(
-            location=[row["lat"], row["lon"]],
-            popup=folium.Popup(popup_html, max_width=300),
-            icon=build_svg_icon(color, "poi"),
-        ).add_to(poi_group)
+    bounds.extend(poi_latlon)
+
+    # All POI markers are created client-side by one script: the popups are embedded once
+    # as data and all markers share one SVG icon, colored via a CSS class per color
+    if poi_latlon:
+        # Colors are looked up once per distinct filter, then spread to the rows through the
+        # category codes; factorize numbers the colors in order of first appearance
+        matching_filters = pd.Categorical(df["Matching Filter"] if "Matching Filter" in df.columns else [""] * len(df))
+        category_colors = np.array(
+            [filter_to_color.get(matching_filter, default_color) for matching_filter in matching_filters.categories]
+            + [default_color],  # Code -1 (missing filter) picks this last entry
+            dtype=object,
+        )
+        color_codes, unique_colors = pd.factorize(category_colors[matching_filters.codes])
+        color_style = "".join(f".wa-poi-color-{idx} {{ color: {color}; }}" for idx, color in enumerate(unique_colors))
+        m.get_root().html.add_child(folium.Element(f"<style>{color_style}</style>"))
+
+        pois = [
+            [lat, lon, color_idx, popup_html]
+            for lat, lon, popup_html, color_idx in zip(
+                poi_lats, poi_lons, build_popup_html(df, is_marker_mode), color_codes.tolist()
+            )
+        ]
+        poi_script = POI_MARKERS_TEMPLATE.substitute(
+            group_name=poi_group.get_name(),
+            icon_html=_script_json(build_svg_icon_html("currentColor", "poi")),
+            icon_classes=_script_json([f"wa-poi-color-{idx}" for idx in range(len(unique_colors))]),
+            pois=_script_json(pois),
+        )
+        m.get_root().html.add_child(folium.Element(poi_script))
 
     if bounds:
         m.fit_bounds(bounds, padding=(24, 24))
@@ -332,6 +411,9 @@ def build_folium_map(
     """)
     m.get_root().html.add_child(folium.Element(scale_script.substitute(map_name=m.get_name())))
 
-    m.save(html_path)
-    add_cdn_integrity(html_path)
+    # Render once and patch the string before the single write, instead of m.save()
+    # followed by reading the file back to add the SRI attribute
+    page = add_cdn_integrity(m.get_root().render())
+    with open(html_path, "w", encoding="utf-8", newline="") as handle:
+        handle.write(page)
     return html_path
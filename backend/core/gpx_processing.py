@@ -1,5 +1,7 @@
 import logging
-import gpxpy
+import xml.etree.ElementTree as ET
+import numpy as np
+import shapely
 from pyproj import Geod
 
 logger = logging.getLogger(__name__)
@@ -8,16 +10,14 @@ logger = logging.getLogger(__name__)
 def load_gpx_track(gpx_file: str):
     """
     Load a GPX file and return a list of (lon, lat) points.
+    Streams the <trkpt> elements with iterparse instead of building the full GPX object model.
     """
-    with open(gpx_file, "r", encoding="utf-8") as f:
-        gpx = gpxpy.parse(f)
-
-    track_points = [
-        (p.longitude, p.latitude)
-        for t in gpx.tracks
-        for s in t.segments
-        for p in s.points
-    ]
+    track_points = []
+    for _, elem in ET.iterparse(gpx_file, events=("end",)):
+        # Namespace-agnostic match: '{http://www.topografix.com/GPX/1/1}trkpt' or plain 'trkpt'
+        if elem.tag == "trkpt" or elem.tag.endswith("}trkpt"):
+            track_points.append((float(elem.get("lon")), float(elem.get("lat"))))
+            elem.clear()
 
     if not track_points:
         logger.error(f"No track points found in {gpx_file}")
@@ -30,22 +30,161 @@ def load_gpx_track(gpx_file: str):
 def compute_track_metrics(track_points):
     """
     Calculate geodetic track length and cumulative distances.
+    All segments go through one vectorized geod.inv call. Besides total_length_km, the
+    result holds contiguous float64 arrays for the array-based stages downstream:
+    distances_km (cumulative, per point) and the point coordinates as lons/lats.
     """
     geod = Geod(ellps="WGS84")
 
-    distances_km = [0.0]
-    total_m = 0.0
-
-    for i in range(1, len(track_points)):
-        lon1, lat1 = track_points[i - 1]
-        lon2, lat2 = track_points[i]
-        _, _, d = geod.inv(lon1, lat1, lon2, lat2)
-        total_m += d
-        distances_km.append(total_m / 1000)
+    coords = np.asarray(track_points, dtype=np.float64).reshape(-1, 2)
+    lons = np.ascontiguousarray(coords[:, 0])
+    lats = np.ascontiguousarray(coords[:, 1])
+    _, _, segment_m = geod.inv(lons[:-1], lats[:-1], lons[1:], lats[1:])
 
-    total_track_length_km = distances_km[-1]
+    # cumsum adds up sequentially, so the totals match the former running sum exactly
+    distances_km = np.concatenate(([0.0], np.cumsum(segment_m) / 1000))
+    total_track_length_km = float(distances_km[-1])
 
     return {
         "distances_km": distances_km,
         "total_length_km": total_track_length_km,
+        "lons": lons,
+        "lats": lats,
     }
+
+
+# Upper bound on POI x track point distances computed per geod.inv call (~24 MB of float64 buffers)
+NEAREST_BATCH_CELLS = 1_000_000
+
+# Lower bounds for WGS84 arc lengths: meridian meters per degree of latitude (at the
+# equator) and semi-major axis meters per degree, times cos(lat), along a parallel
+MIN_METERS_PER_DEG_LAT = 110_574.0
+METERS_PER_DEG_LON_EQUATOR = 111_319.0
+
+# WGS84 semi-major axis and first eccentricity squared, for the local equirectangular pre-pick
+WGS84_A = 6_378_137.0
+WGS84_E2 = 0.00669437999014
+
+# Equirectangular distances are within well under 1% of the geodesic ones at search-radius
+# scale; pairs further than this factor above the POI's planar minimum cannot be its nearest
+PLANE_MARGIN = 1.02
+
+
+def _scan_track_positions(geod: Geod, track_lons, track_lats, distances_km, lons, lats):
+    """Brute-force nearest track point: POI blocks x all track points, one geod.inv call per block."""
+    n_pois = lons.shape[0]
+    n_track = track_lons.shape[0]
+    min_dist_m = np.empty(n_pois, dtype=np.float64)
+    closest_km = np.empty(n_pois, dtype=np.float64)
+    step = max(1, NEAREST_BATCH_CELLS // max(n_track, 1))
+
+    for start in range(0, n_pois, step):
+        stop = min(start + step, n_pois)
+        count = stop - start
+        _, _, dists_m = geod.inv(
+            np.repeat(lons[start:stop], n_track),
+            np.repeat(lats[start:stop], n_track),
+            np.tile(track_lons, count),
+            np.tile(track_lats, count),
+        )
+        dists_m = dists_m.reshape(count, n_track)
+        idx = np.argmin(dists_m, axis=1)  # First closest point, like a strict '<' scan
+        min_dist_m[start:stop] = dists_m[np.arange(count), idx]
+        closest_km[start:stop] = distances_km[idx]
+
+    return min_dist_m, closest_km
+
+
+def nearest_track_positions(geod: Geod, track_lons, track_lats, distances_km, lons, lats, max_distance_m=None):
+    """
+    Find the closest track point for every POI in (lons, lats).
+    track_lons/track_lats/distances_km are float64 arrays (see compute_track_metrics).
+    Returns two float64 arrays: distance in meters and kilometers from start at that point.
+
+    With max_distance_m, an STRtree over the track points limits the geodesic work to
+    points inside a lon/lat box that contains everything within max_distance_m of the POI.
+    POIs without any track point that close get inf distance and NaN kilometers.
+    A local equirectangular distance then drops the pairs that cannot be the nearest one,
+    so only a few geod.inv evaluations remain per POI.
+    """
+    lons = np.asarray(lons, dtype=np.float64)
+    lats = np.asarray(lats, dtype=np.float64)
+    if max_distance_m is None:
+        return _scan_track_positions(geod, track_lons, track_lats, distances_km, lons, lats)
+
+    min_dist_m = np.full(lons.shape[0], np.inf)
+    closest_km = np.full(lons.shape[0], np.nan)
+
+    # Any path shorter than max_distance_m stays within dlat of the POI latitude, where a
+    # degree of longitude is at least METERS_PER_DEG_LON_EQUATOR * cos(lat_max) long
+    dlat = max_distance_m / MIN_METERS_PER_DEG_LAT * 1.001
+    cos_lat_max = np.cos(np.radians(np.minimum(np.abs(lats) + dlat, 90.0)))
+    with np.errstate(divide="ignore"):
+        dlon = max_distance_m / (METERS_PER_DEG_LON_EQUATOR * cos_lat_max) * 1.001
+
+    # Boxes over a pole or across the antimeridian fall back to the full scan
+    wide = (lons - dlon < -180.0) | (lons + dlon > 180.0)
+
+    # Two comparisons per axis reject POIs whose box misses the whole track's bounding box
+    far = (lats + dlat < track_lats.min()) | (lats - dlat > track_lats.max())
+    far |= ~wide & ((lons + dlon < track_lons.min()) | (lons - dlon > track_lons.max()))
+    wide &= ~far
+
+    if wide.any():
+        min_dist_m[wide], closest_km[wide] = _scan_track_positions(
+            geod, track_lons, track_lats, distances_km, lons[wide], lats[wide]
+        )
+
+    narrow = np.flatnonzero(~wide & ~far)
+    if narrow.size == 0:
+        return min_dist_m, closest_km
+
+    tree = shapely.STRtree(shapely.points(track_lons, track_lats))
+    boxes = shapely.box(
+        lons[narrow] - dlon[narrow], lats[narrow] - dlat, lons[narrow] + dlon[narrow], lats[narrow] + dlat
+    )
+    box_idx, track_idx = tree.query(boxes)
+    if box_idx.size == 0:
+        return min_dist_m, closest_km
+    poi_idx = narrow[box_idx]
+
+    # Meters per degree at the pair's mean latitude (meridian and prime vertical radii)
+    mid_lat = np.radians((lats[poi_idx] + track_lats[track_idx]) * 0.5)
+    w = np.sqrt(1.0 - WGS84_E2 * np.sin(mid_lat) ** 2)
+    ky = np.radians(WGS84_A * (1.0 - WGS84_E2)) / w**3
+    kx = np.radians(WGS84_A) * np.cos(mid_lat) / w
+    plane_m = np.hypot((track_lons[track_idx] - lons[poi_idx]) * kx, (track_lats[track_idx] - lats[poi_idx]) * ky)
+
+    plane_min = np.full(lons.shape[0], np.inf)
+    np.minimum.at(plane_min, poi_idx, plane_m)
+    keep = plane_m <= np.minimum(plane_min[poi_idx] * PLANE_MARGIN + 1.0, max_distance_m * PLANE_MARGIN)
+    poi_idx = poi_idx[keep]
+    track_idx = track_idx[keep]
+    if poi_idx.size == 0:
+        return min_dist_m, closest_km
+
+    dists_m = np.empty(poi_idx.shape[0], dtype=np.float64)
+    for start in range(0, poi_idx.shape[0], NEAREST_BATCH_CELLS):
+        stop = start + NEAREST_BATCH_CELLS
+        _, _, dists_m[start:stop] = geod.inv(
+            lons[poi_idx[start:stop]],
+            lats[poi_idx[start:stop]],
+            track_lons[track_idx[start:stop]],
+            track_lats[track_idx[start:stop]],
+        )
+
+    # Per POI: smallest distance first, lowest track index among ties (like a strict '<' scan)
+    order = np.lexsort((track_idx, dists_m, poi_idx))
+    first = np.flatnonzero(np.r_[True, np.diff(poi_idx[order]) != 0])
+    best = order[first]
+    min_dist_m[poi_idx[best]] = dists_m[best]
+    closest_km[poi_idx[best]] = distances_km[track_idx[best]]
+    return min_dist_m, closest_km
+
+
+def points_at_km(track_lons, track_lats, distances_km, kms):
+    """
+    (lons, lats) arrays of the points kms kilometers along the track, interpolated linearly
+    in lon/lat between the surrounding track points (see compute_track_metrics for the inputs).
+    """
+    return np.interp(kms, distances_km, track_lons), np.interp(kms, distances_km, track_lats)
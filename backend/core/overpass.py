@@ -1,14 +1,87 @@
+import os
 import time
+import gzip
+import json
+import hashlib
+import threading
 import logging
 import requests
 import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+
+try:
+    import ijson  # Incremental parsing of large responses; r.json() remains the fallback
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Faster parser for the responses read in one go
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Responses with a known size below this are parsed in one go with r.json()
+STREAM_MIN_BYTES = 1024 * 1024
+
+# Longest server-requested back-off we honor between retry rounds
+MAX_RETRY_AFTER_SECONDS = 60
+
+# Shared keep-alive connection pool for all Overpass requests (one pool per server host).
+# requests already sends "Accept-Encoding: gzip, deflate", which Overpass honors.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# Concurrent requests per Overpass server across all jobs of this process
+# (public instances grant about two query slots per client)
+MAX_REQUESTS_PER_SERVER = 2
+_server_slots = {}
+_server_slots_lock = threading.Lock()
+
+
+def _server_slot(server: str) -> threading.BoundedSemaphore:
+    """Return the process-wide request semaphore for an Overpass server URL."""
+    with _server_slots_lock:
+        slot = _server_slots.get(server)
+        if slot is None:
+            slot = _server_slots[server] = threading.BoundedSemaphore(MAX_REQUESTS_PER_SERVER)
+        return slot
+
+
+def _overpass_regex_escape(value: str) -> str:
+    """Escape regex metacharacters for an Overpass QL string (the backslash itself is escaped for QL)."""
+    return "".join(f"\\\\{char}" if char in r"\.^$|?*+()[]{}" else char for char in value)
+
+
+@lru_cache(maxsize=32)
+def _tag_filters(include_filters: tuple) -> tuple:
+    """
+    Overpass tag filters for the include list, one per key, parsed once per filter set
+    rather than for every batch.
+    """
+    values_by_key = {}
+    for inc in include_filters:
+        key, value = inc.split("=", 1)
+        values_by_key.setdefault(key, {})[value] = None  # Ordered set of values
+
+    tag_filters = []
+    for key, values in values_by_key.items():
+        if len(values) == 1:
+            tag_filters.append(f'["{key}"="{next(iter(values))}"]')
+        else:
+            # Several values of one key share a statement (and the long centers list)
+            alternatives = "|".join(_overpass_regex_escape(value) for value in values)
+            tag_filters.append(f'["{key}"~"^({alternatives})$"]')
+    return tuple(tag_filters)
+
 
 def build_overpass_query_batch(points, radius_km, include_filters):
     """
-    Build an Overpass query with multiple circle searches batched together.
+    Build an Overpass query searching around all batch points at once.
     
     Args:
         points: List of (lon, lat) tuples for query centers
@@ -18,14 +91,13 @@ def build_overpass_query_batch(points, radius_km, include_filters):
     Returns:
         Overpass QL query string
     """
-    include_parts = []
-    for inc in include_filters:
-        key, value = inc.split("=", 1)
-        for lon, lat in points:
-            for obj_type in ("node", "way", "relation"):
-                include_parts.append(
-                    f'{obj_type}["{key}"="{value}"](around:{radius_km * 1000},{lat},{lon});'
-                )
+    # One nwr statement per tag key: with several coordinates, around: searches the
+    # corridor along the polyline through the consecutive query centers
+    centers = ",".join(f"{lat},{lon}" for lon, lat in points)
+    include_parts = [
+        f'nwr{tag_filter}(around:{radius_km * 1000},{centers});'
+        for tag_filter in _tag_filters(tuple(include_filters))
+    ]
 
     include_block = "\n      ".join(include_parts)
 
@@ -39,23 +111,89 @@ def build_overpass_query_batch(points, radius_km, include_filters):
     return query
 
 
+def _parse_retry_after(value) -> int:
+    """Seconds from a numeric Retry-After header (0 if absent or an HTTP date), capped."""
+    try:
+        return min(max(int(value), 0), MAX_RETRY_AFTER_SECONDS)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _read_overpass_response(r) -> dict:
+    """
+    Parse an Overpass JSON response.
+    Large or unknown-size bodies are streamed with ijson, building only the element dicts
+    instead of holding the raw text and the parsed document at the same time.
+    """
+    content_length = r.headers.get("Content-Length")
+    if ijson is None or (content_length is not None and int(content_length) < STREAM_MIN_BYTES):
+        return orjson.loads(r.content) if orjson is not None else r.json()
+
+    r.raw.decode_content = True  # Let urllib3 undo gzip/deflate
+    return {"elements": list(ijson.items(r.raw, "elements.item", use_float=True))}
+
+
+def _cache_file(cache_dir: str, query: str) -> str:
+    return os.path.join(cache_dir, hashlib.sha256(query.encode("utf-8")).hexdigest() + ".json.gz")
+
+
+def _load_cached_response(cache_file: str, ttl_hours: float):
+    """Return the cached response for a query, or None if missing, expired or unreadable."""
+    try:
+        if time.time() - os.path.getmtime(cache_file) > ttl_hours * 3600:
+            return None
+        with gzip.open(cache_file, "rb") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable Overpass cache file {cache_file}: {e}")
+        return None
+
+
+def _store_cached_response(cache_file: str, data: dict):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_file, "wt", encoding="utf-8", compresslevel=5) as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_file, cache_file)  # Concurrent batches never see half-written files
+    except Exception as e:
+        logger.warning(f"Failed to write Overpass cache file {cache_file}: {e}")
+
+
 def query_overpass_with_retries(query: str, overpass_cfg: dict):
     """
     Execute an Overpass query with multiple servers and retries.
+    With overpass_cfg["cache_dir"] set, successful responses are kept on disk per query
+    text for cache_ttl_hours and reused instead of contacting the servers.
     """
     servers = overpass_cfg.get("servers", [])
     retries = overpass_cfg.get("retries", 3)
 
+    cache_dir = overpass_cfg.get("cache_dir")
+    cache_file = _cache_file(cache_dir, query) if cache_dir else None
+    if cache_file:
+        cached = _load_cached_response(cache_file, overpass_cfg.get("cache_ttl_hours", 24.0))
+        if cached is not None:
+            logger.info(f"Overpass query served from cache {cache_file}")
+            return cached
+
     for attempt in range(retries):
+        retry_after = 0
         for server in servers:
             try:
-                r = requests.post(server, data=query, timeout=60)
-                if r.status_code == 200:
-                    logger.info(f"Overpass query successful from {server}")
-                    return r.json()
+                with _server_slot(server), _session.post(server, data=query, timeout=60, stream=True) as r:
+                    if r.status_code == 200:
+                        data = _read_overpass_response(r)
+                        logger.info(f"Overpass query successful from {server}")
+                        if cache_file:
+                            _store_cached_response(cache_file, data)
+                        return data
+                    retry_after = max(retry_after, _parse_retry_after(r.headers.get("Retry-After")))
             except Exception as e:
                 logger.debug(f"Overpass server {server} failed: {e}")
-        wait = 2 * (attempt + 1)
+        wait = max(2 * (attempt + 1), retry_after)
         logger.warning(f"Overpass error – Retrying in {wait}s (attempt {attempt + 1}/{retries})")
         time.sleep(wait)
 
@@ -63,6 +201,31 @@ def query_overpass_with_retries(query: str, overpass_cfg: dict):
     return {"elements": []}
 
 
+def dedupe_query_points(points, radius_km: float):
+    """
+    Drop query centers that revisit an already covered grid cell of ~radius_km/2.
+    Out-and-back and looping tracks otherwise search the same area several times.
+    Consecutive centers may share a cell (small steps, curvy sections) and are always kept:
+    a center is only skipped if its cell was covered before and the previous center was not
+    a kept center in that same cell.
+    """
+    dlat = radius_km / 111 / 2
+    cell_last_kept = {}
+    unique_points = []
+    for idx, (lon, lat) in enumerate(points):
+        dlon = dlat / max(math.cos(math.radians(lat)), 0.1)
+        cell = (round(lat / dlat), round(lon / dlon))
+        last_idx = cell_last_kept.get(cell)
+        if last_idx is not None and last_idx != idx - 1:
+            continue
+        cell_last_kept[cell] = idx
+        unique_points.append((lon, lat))
+
+    if len(unique_points) < len(points):
+        logger.info(f"Skipped {len(points) - len(unique_points)} query points in already covered cells")
+    return unique_points
+
+
 def query_overpass_segmented(
     track_points,
     track_info,
@@ -78,12 +241,9 @@ def query_overpass_segmented(
     Queries are batched to reduce API calls: multiple search circles are
     combined into single requests based on batch_km configuration.
     """
-    from shapely.geometry import LineString
-    from pyproj import Transformer
+    import numpy as np
     from tqdm import tqdm
-
-    transformer = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
-    track_points_m = [transformer.transform(*p) for p in track_points]
+    from backend.core.gpx_processing import points_at_km
 
     total_track_length_km = track_info["total_length_km"]
 
@@ -91,22 +251,11 @@ def query_overpass_segmented(
     if len(track_points) < 2:
         query_points = [track_points[0]]
     else:
-        track_line = LineString(track_points_m)
-        track_length_m_proj = track_line.length
-
-        def point_at_km(km):
-            m = (km / total_track_length_km) * track_length_m_proj
-            x, y = track_line.interpolate(m).xy
-            lon, lat = transformer.transform(x[0], y[0], direction="INVERSE")
-            return lon, lat
-
-        # Calculate all query points along the track
+        # Sample the query points straight from the cumulative geodesic distances, no projection
         num_steps = math.ceil(total_track_length_km / step_km)
-        query_points = []
-        for step in range(num_steps + 1):
-            km = min(step * step_km, total_track_length_km)
-            lon, lat = point_at_km(km)
-            query_points.append((lon, lat))
+        kms = np.minimum(np.arange(num_steps + 1) * step_km, total_track_length_km)
+        lons, lats = points_at_km(track_info["lons"], track_info["lats"], track_info["distances_km"], kms)
+        query_points = dedupe_query_points(list(zip(lons.tolist(), lats.tolist())), radius_km)
 
     # Calculate batch size based on batch_km configuration
     batch_km = overpass_cfg.get("batch_km", 50)  # Default 50km per batch
@@ -120,23 +269,42 @@ def query_overpass_segmented(
     logger.info(f"Querying {total_track_length_km:.1f}km track with {len(batches)} batched Overpass calls")
     logger.info(f"Search points: {len(query_points)}, ~{points_per_batch} points per batch")
 
-    all_elements = []
-    seen_ids = set()
+    servers = overpass_cfg.get("servers", [])
+    results = [None] * len(batches)
 
-    for batch_idx, batch_points in enumerate(tqdm(batches, desc="Overpass queries")):
-        query = build_overpass_query_batch(batch_points, radius_km, include_filters)
-        data = query_overpass_with_retries(query, overpass_cfg)
+    def run_batch(batch_idx):
+        # Round-robin the first server per batch so concurrent batches spread across servers
+        offset = batch_idx % len(servers) if servers else 0
+        batch_cfg = dict(overpass_cfg, servers=servers[offset:] + servers[:offset])
+        query = build_overpass_query_batch(batches[batch_idx], radius_km, include_filters)
+        return query_overpass_with_retries(query, batch_cfg)
 
-        if progress_cb:
-            try:
-                progress_cb(batch_idx + 1, len(batches))
-            except Exception:
-                logger.debug("Progress callback failed", exc_info=True)
+    # Batches are IO-bound: overlap them; _server_slot also caps requests per server across jobs
+    max_workers = max(1, min(8, len(servers) * MAX_REQUESTS_PER_SERVER, len(batches)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_batch, batch_idx): batch_idx for batch_idx in range(len(batches))}
+        for done, future in enumerate(
+            tqdm(as_completed(futures), total=len(futures), desc="Overpass queries"), start=1
+        ):
+            results[futures[future]] = future.result()
+
+            if progress_cb:
+                try:
+                    progress_cb(done, len(batches))
+                except Exception:
+                    logger.debug("Progress callback failed", exc_info=True)
+
+    # Merge in batch order so the first occurrence of an element wins as before
+    all_elements = []
+    seen_ids = set()
 
+    for data in results:
         for el in data.get("elements", []):
-            if el["id"] in seen_ids:
+            # OSM ids are only unique per type: node 1 and way 1 are different objects
+            osm_key = (el.get("type"), el["id"])
+            if osm_key in seen_ids:
                 continue
-            seen_ids.add(el["id"])
+            seen_ids.add(osm_key)
             all_elements.append(el)
 
     return all_elements
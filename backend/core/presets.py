@@ -1,13 +1,28 @@
+import os
+from functools import lru_cache
+
 import yaml
 
+try:
+    # libyaml-backed loader, same safe subset as yaml.safe_load
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+@lru_cache(maxsize=4)
+def _load_presets_cached(path: str, mtime_ns: int) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    return data.get("presets", {})
+
 
 def load_presets(path: str) -> dict:
     """
     Load presets.yaml and return a dictionary.
+    The parsed file is cached until its mtime changes; treat the result as read-only.
     """
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    return data.get("presets", {})
+    return _load_presets_cached(path, os.stat(path).st_mtime_ns)
 
 
 def validate_filter_syntax(filter_str: str):
@@ -62,12 +77,9 @@ def apply_presets_to_filters(
     if cli_exclude:
         exclude.extend(cli_exclude)
 
-    # Remove duplicates
-    include = list(dict.fromkeys(include))
-    exclude = list(dict.fromkeys(exclude))
-
-    # Validierung
-    for f in include + exclude:
-        validate_filter_syntax(f)
+    # Validate once and normalize to "key=value" without surrounding whitespace, the form
+    # the query builder, the filtering and the map colors all use; then remove duplicates
+    include = list(dict.fromkeys("=".join(validate_filter_syntax(f)) for f in include))
+    exclude = list(dict.fromkeys("=".join(validate_filter_syntax(f)) for f in exclude))
 
     return include, exclude
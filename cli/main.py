@@ -4,16 +4,15 @@ import os
 import logging
 from dotenv import load_dotenv
 
+# Repo root (parent of cli/), computed once
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_ROOT)
 
 from backend.core.cli import parse_cli_args
-from backend.core.presets import load_presets, apply_presets_to_filters
-from backend.core.gpx_processing import load_gpx_track, compute_track_metrics
-from backend.core.overpass import query_overpass_segmented
-from backend.core.filtering import filter_elements_and_build_rows
-from backend.core.export import export_to_excel
-from backend.core.folium_map import build_folium_map
+# Pipeline stages (numpy, pandas, shapely, pyproj, folium) are imported in run_pipeline,
+# so --help and argument errors return without loading them
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +28,7 @@ def load_cli_config(args) -> dict:
         dict: Complete configuration dictionary
     """
     # Load config/cli/.env file
-    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    env_path = os.path.join(repo_root, 'config', 'cli', '.env')
+    env_path = os.path.join(REPO_ROOT, 'config', 'cli', '.env')
     
     if os.path.exists(env_path):
         load_dotenv(env_path)
@@ -58,6 +56,12 @@ def load_cli_config(args) -> dict:
             return int(os.getenv(key, default))
         except (ValueError, TypeError):
             return default
+
+    def get_bool(key: str, default: bool = False) -> bool:
+        value = os.getenv(key)
+        if value is None:
+            return default
+        return value.strip().lower() in {'1', 'true', 'yes', 'on'}
     
     # Build config from environment variables
     config = {
@@ -65,6 +69,7 @@ def load_cli_config(args) -> dict:
             'name': os.getenv('WA_PROJECT_NAME', 'MyProject'),
             'output_path': os.getenv('WA_OUTPUT_PATH', '../data/output'),
             'timezone': os.getenv('WA_TIMEZONE', 'UTC'),
+            'keep_parquet': get_bool('WA_KEEP_PARQUET'),
         },
         'input': {
             'gpx_file': os.getenv('WA_GPX_FILE', '../data/input/example.gpx'),
@@ -86,6 +91,8 @@ def load_cli_config(args) -> dict:
                 'https://overpass-api.de/api/interpreter',
                 'https://lz4.overpass-api.de/api/interpreter',
             ],
+            'cache_dir': os.getenv('WA_OVERPASS_CACHE_DIR') or None,  # None = no response cache
+            'cache_ttl_hours': get_float('WA_OVERPASS_CACHE_TTL_HOURS', 24.0),
         },
         'map': {
             'track_color': os.getenv('WA_TRACK_COLOR', 'blue'),
@@ -108,21 +115,27 @@ def load_cli_config(args) -> dict:
         config['search']['radius_km'] = args.radius_km
     if args.step_km is not None:
         config['search']['step_km'] = args.step_km
+    if args.no_cache:
+        config['overpass']['cache_dir'] = None
     
     # Auto-calculate step_km if not set
     if config['search']['step_km'] is None:
         config['search']['step_km'] = config['search']['radius_km'] * 0.6
     
-    # Resolve relative paths to absolute (relative to repo root, already calculated above)
+    # Resolve relative paths to absolute (relative to repo root)
     config['project']['output_path'] = os.path.abspath(
-        os.path.join(repo_root, config['project']['output_path'])
+        os.path.join(REPO_ROOT, config['project']['output_path'])
     )
     config['input']['gpx_file'] = os.path.abspath(
-        os.path.join(repo_root, config['input']['gpx_file'])
+        os.path.join(REPO_ROOT, config['input']['gpx_file'])
     )
     config['presets_file'] = os.path.abspath(
-        os.path.join(repo_root, config['presets_file'])
+        os.path.join(REPO_ROOT, config['presets_file'])
     )
+    if config['overpass']['cache_dir']:
+        config['overpass']['cache_dir'] = os.path.abspath(
+            os.path.join(REPO_ROOT, config['overpass']['cache_dir'])
+        )
     
     return config
 
@@ -153,6 +166,13 @@ def run_pipeline(
     Returns:
         dict: Results containing paths to Excel and HTML files, dataframe, and metadata
     """
+    from backend.core.presets import load_presets, apply_presets_to_filters
+    from backend.core.gpx_processing import load_gpx_track, compute_track_metrics
+    from backend.core.overpass import query_overpass_segmented
+    from backend.core.filtering import filter_elements_and_build_rows
+    from backend.core.export import export_to_excel, export_to_parquet
+    from backend.core.folium_map import build_folium_map
+
     def report_progress(percent: float, message: str):
         if progress_callback:
             try:
@@ -166,8 +186,7 @@ def run_pipeline(
     presets_file = config.get("presets_file", "data/presets.yaml")
     if not os.path.isabs(presets_file):
         # If called from backend, make relative paths absolute from repo root
-        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        presets_file = os.path.abspath(os.path.join(repo_root, presets_file))
+        presets_file = os.path.abspath(os.path.join(REPO_ROOT, presets_file))
     
     presets = load_presets(presets_file)
 
@@ -215,7 +234,7 @@ def run_pipeline(
     report_progress(75, f"Fetched {len(elements)} raw results. Filtering...")
 
     # Filter elements and generate tabular data
-    rows, df = filter_elements_and_build_rows(
+    df = filter_elements_and_build_rows(
         elements=elements,
         track_points=track_points,
         track_info=track_info,
@@ -223,7 +242,7 @@ def run_pipeline(
         exclude_filters=exclude_filters,
         include_filters=include_filters,
     )
-    report_progress(82, f"Filtered {len(rows)} results. Exporting...")
+    report_progress(82, f"Filtered {len(df)} results. Exporting...")
 
     # Export to Excel
     excel_path = export_to_excel(
@@ -233,6 +252,14 @@ def run_pipeline(
         filename=excel_filename,
         track_points=track_points,
     )
+    # Optional Parquet sidecar next to the Excel file for fast reloads
+    parquet_path = None
+    if config["project"].get("keep_parquet"):
+        parquet_path = export_to_parquet(
+            df=df,
+            output_path=config["project"]["output_path"],
+            filename=os.path.splitext(os.path.basename(excel_path))[0],
+        )
     report_progress(90, "Excel exported. Building map...")
 
     # Generate Folium map
@@ -250,6 +277,7 @@ def run_pipeline(
     return {
         "excel_path": excel_path,
         "html_path": html_path,
+        "parquet_path": parquet_path,
         "dataframe": df,
         "rows_count": len(df),
         "track_length_km": track_info["total_length_km"],
@@ -283,6 +311,8 @@ def main():
         print(f"✅ Done! {result['rows_count']} objects found.")
         print(f"📄 Excel: {result['excel_path']}")
         print(f"🌍 Map: {result['html_path']}")
+        if result['parquet_path']:
+            print(f"🗃️ Parquet: {result['parquet_path']}")
     except Exception as e:
         logger.error(f"Pipeline failed: {e}", exc_info=True)
         sys.exit(1)
@@ -9,7 +9,7 @@ export function useWebSocket(jobId: string | null, onJobUpdate: (job: JobStatus)
   useEffect(() => {
     const socket = io('/', {
       path: '/socket.io',
-      transports: ['polling'],  // Use polling only, more reliable with dev server
+      transports: ['websocket', 'polling'],  // WebSocket first, fall back to long-polling
     })
     socketRef.current = socket
 
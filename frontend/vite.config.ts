@@ -64,7 +64,7 @@ export default defineConfig(({ mode }) => {
         '/socket.io': {
           target: backendTarget,
           changeOrigin: true,
-          ws: false,  // Disable WebSocket upgrade, use polling only
+          ws: true,  // Proxy WebSocket upgrades (client falls back to polling)
         },
       },
     },
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from backend.core import overpass
+from backend.core.overpass import dedupe_query_points
+
+
+def test_dedupe_keeps_small_steps_along_straight_line():
+    # 0.38 km steps with a 5 km radius: many consecutive centers share a grid cell
+    points = [(10.0 + i * 0.38 / 76, 47.0) for i in range(10)]
+    assert dedupe_query_points(points, 5.0) == points
+
+
+def test_dedupe_skips_out_and_back_revisit():
+    outbound = [(10.0 + i * 0.05, 47.0) for i in range(6)]
+    track = outbound + outbound[-2::-1]
+    kept = dedupe_query_points(track, 2.0)
+    assert kept[: len(outbound)] == outbound
+    assert len(kept) < len(track)
+
+
+def test_server_requests_are_capped_across_callers(monkeypatch):
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    class FakeResponse:
+        status_code = 200
+        headers = {}
+
+        def __enter__(self):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.02)
+            return self
+
+        def __exit__(self, *exc):
+            with lock:
+                in_flight["now"] -= 1
+
+    monkeypatch.setattr(overpass._session, "post", lambda *args, **kwargs: FakeResponse())
+    monkeypatch.setattr(overpass, "_read_overpass_response", lambda r: {"elements": []})
+    cfg = {"servers": ["https://overpass.test/api/interpreter"]}
+    threads = [
+        threading.Thread(target=overpass.query_overpass_with_retries, args=(f"q{i}", cfg)) for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert in_flight["max"] <= overpass.MAX_REQUESTS_PER_SERVER